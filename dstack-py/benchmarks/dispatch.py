@@ -0,0 +1,56 @@
+"""Measure how long it takes `AutoHandler` to select an encoder and a decoder factory.
+
+    $ PYTHONPATH=. python benchmarks/dispatch.py
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from dstack.auto import AutoHandler
+from dstack.content import MediaType
+from dstack.handler import _mro_names
+
+NUMBER = 10000
+
+
+def linear_find(obj, chain):
+    for factory in chain:
+        if factory.accept(obj):
+            return factory
+
+
+def main():
+    handler = AutoHandler()
+    encoders = handler.encoders.factories
+    decoders = handler.decoders.factories
+    objects = [pd.DataFrame({"x": [1]}), np.zeros(1), pd.Series([1])]
+    media = [MediaType("text/csv", "pandas/dataframe"), MediaType("application/octet-stream", "torch/state")]
+
+    def linear_encoders():
+        _mro_names.cache_clear()
+        for obj in objects:
+            linear_find(obj, encoders)
+
+    def indexed_encoders():
+        for obj in objects:
+            AutoHandler().encoders.find(obj)
+
+    def linear_decoders():
+        for m in media:
+            linear_find(m, decoders)
+
+    def indexed_decoders():
+        for m in media:
+            AutoHandler().decoders.find(m)
+
+    for name, func, lookups in [("encoders, linear", linear_encoders, len(objects)),
+                                ("encoders, indexed", indexed_encoders, len(objects)),
+                                ("decoders, linear", linear_decoders, len(media)),
+                                ("decoders, indexed", indexed_decoders, len(media))]:
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER / lookups
+        print(f"{name}: {seconds * 1e6:.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,33 @@
 import base64
+import importlib
 import json
 import os
+import shutil
+import sys
+import time
 import typing as ty
+from concurrent.futures import ThreadPoolExecutor, Future
 from functools import wraps
+from uuid import uuid4
 
 from deprecation import deprecated
 
 from dstack.md import Markdown as _Markdown
-from dstack.auto import AutoHandler
 from dstack.config import Config, ConfigFactory, YamlConfigFactory, \
-    from_yaml_file, ConfigurationError, get_config, Profile, _get_config_path
-from dstack.content import StreamContent, BytesContent, MediaType, FileContent
+    from_yaml_file, ConfigurationError, get_config, Profile, get_cache_dir
+from dstack.content import StreamContent, BytesContent, MediaType, FileContent, Content, RangeContent
 from dstack.context import Context
 from dstack.controls import Control, Select, Input, Output, Markdown, Slider, Uploader, Upload, Checkbox
 from dstack.handler import Encoder, Decoder, T, DecoratedValue
-from dstack.protocol import Protocol, JsonProtocol, MatchError, create_protocol
-from dstack.stack import EncryptionMethod, NoEncryption, StackFrame, merge_or_none, FrameData, PushResult, FrameMeta
+from dstack.lazy import LazyFrameData, Segments, prefetch
+from dstack.protocol import Protocol, JsonProtocol, MatchError, StackNotFoundError, create_protocol, find_attach
+from dstack.util import unpacked_path
+from dstack.stack import EncryptionMethod, NoEncryption, StackFrame, merge_or_none, FrameData, PushResult, FrameMeta, \
+    PullResult, FrameInfo
 
 import inspect
 from pathlib import Path
 from types import ModuleType
-from dstack.tqdm import tqdm, trange
 
 from dstack.application.dependencies import Dependency, RequirementsDependency, ProjectDependency, ModuleDependency, \
     PackageDependency
@@ -30,6 +37,35 @@ from dstack.version import __version__
 __all__ = ['__version__', 'Control', 'Output', 'Input', 'Select', 'Slider', 'Markdown', 'Uploader', 'Checkbox',
            'Upload', 'tqdm', 'trange']
 
+import dstack.tqdm as _tqdm
+
+trange = _tqdm.trange
+
+# public names which are imported on the first access, because their modules are expensive to import
+_LAZY = {"AutoHandler": "dstack.auto", "register_encoder": "dstack.auto", "register_decoder": "dstack.auto",
+         "tqdm": "dstack.tqdm"}
+
+if sys.version_info >= (3, 7):
+    # importing the module binds its name in the package, but the name belongs to the class, which is defined lazily
+    del tqdm
+
+    def __getattr__(name: str):
+        if name in _LAZY:
+            return getattr(importlib.import_module(_LAZY[name]), name)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY))
+else:
+    # module __getattr__ requires Python 3.7, so older versions import these names eagerly
+    for _name, _module in _LAZY.items():
+        globals()[_name] = getattr(importlib.import_module(_module), _name)
+
+
+def _auto_handler(**options) -> ty.Any:
+    from dstack.auto import AutoHandler
+    return AutoHandler(**options)
+
 
 def push(stack: str, obj, description: ty.Optional[str] = None,
          access: ty.Optional[str] = None,
@@ -225,63 +261,547 @@ def get_encryption(profile: Profile) -> EncryptionMethod:
 
 # TODO: Write tests that ensures that cache works
 def pull_data(context: Context, params: ty.Optional[ty.Dict] = None,
-              meta: ty.Optional[ty.Dict] = None, **kwargs) -> FrameData:
-    path = context.stack_path()
+              meta: ty.Optional[ty.Dict] = None, ranged: bool = False, **kwargs) -> FrameData:
+    frame, index, attach = _pull_attach(context, params, meta, **kwargs)
+    return _attach_data(attach, context, frame, index, ranged)
+
+
+def _pull_attach(context: Context, params: ty.Optional[ty.Dict] = None,
+                 meta: ty.Optional[ty.Dict] = None,
+                 frame: ty.Optional[str] = None,
+                 attach_index: ty.Optional[int] = None,
+                 **kwargs) -> ty.Tuple[str, int, ty.Dict]:
     params = merge_or_none(params, kwargs)
+    path = context.stack_path()
+    token = context.profile.token
+
+    if frame is None and attach_index is None:
+        # TODO: Split context.protocol.pull into to pull_head and pull_frame
+        frame, index, res = context.protocol.pull(path, token, params, meta)
+        return frame, index, res["attachment"]
+
+    # a known frame or attachment doesn't require the stack document
+    if frame is None:
+        frame = context.protocol.head(path, token)["head"]["id"]
+
+    if attach_index is None:
+        attach_index = find_attach(context.protocol.frame(path, token, frame)["attachments"], params)
+        if attach_index is None:
+            raise MatchError(params or {}, meta or {})
+
+    return frame, attach_index, context.protocol.attachment(path, token, frame, attach_index)
 
-    # TODO: Split context.protocol.pull into to pull_head and pull_frame
-    frame, index, res = context.protocol.pull(path, context.profile.token, params, meta)
-    attach = res["attachment"]
 
-    data = _cache_attach_data(attach, context, frame, index, path)
+def _attach_data(attach: ty.Dict, context: Context, frame: str, index: int, ranged: bool = False) -> FrameData:
+    data = _range_attach_data(attach, context, frame, index, context.stack_path()) if ranged else None
+    data = data or _cache_attach_data(attach, context, frame, index, context.stack_path())
 
     media_type = MediaType(attach["content_type"], attach.get("application", None))
     return FrameData(data, media_type, attach.get("description", None),
                      attach.get("params", None), attach.get("settings", None))
 
 
-def _cache_attach_data(attach, context, frame, index, path):
-    cache_dir = _get_config_path().parent / "cache"
+# content types of seekable formats which decoders read by ranges
+_RANGED_CONTENT_TYPES = {"application/vnd.apache.parquet"}
+
+
+def _cache_files(path: str, frame: str, index: int) -> ty.Tuple[Path, Path]:
+    cache_dir = get_cache_dir()
     file = cache_dir / "files" / os.sep.join(path.split("/")) / frame / str(index)
     attach_file = cache_dir / "attachs" / os.sep.join(path.split("/")) / frame / (str(index) + ".json")
-    if not file.exists() or not attach_file.exists() or file.stat().st_size != attach.get("length"):
-        data = BytesContent(base64.b64decode(attach["data"])) if "data" in attach else \
-            StreamContent(*context.protocol.download(attach["download_url"]))
+    return file, attach_file
 
-        if file.exists():
-            os.remove(file)
-        if attach_file.exists():
-            os.remove(attach_file)
 
-        file.parent.mkdir(parents=True, exist_ok=True)
-        data.to_file(file, show_progress=False)
+def _is_cached(attach: ty.Dict, file: Path, attach_file: Path) -> bool:
+    return file.exists() and attach_file.exists() and file.stat().st_size == attach.get("length")
 
-        attach_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(attach_file, 'a') as a:
-            a.write(json.dumps(attach))
+
+def _range_attach_data(attach, context, frame, index, path) -> ty.Optional[Content]:
+    # an attachment which isn't cached yet is read by ranges, so only the parts a decoder asks for are downloaded;
+    # other formats than Parquet are read sequentially, so they are downloaded at once and cached instead
+    file, attach_file = _cache_files(path, frame, index)
+    if attach["content_type"] not in _RANGED_CONTENT_TYPES or _is_cached(attach, file, attach_file) \
+            or "download_url" not in attach or attach.get("length") is None:
+        return None
+
+    url = attach["download_url"]
+
+    def fetch(start: int, end: int) -> bytes:
+        if not _is_cached(attach, file, attach_file):
+            chunk = context.protocol.download_range(url, start, end)
+            if len(chunk) < attach["length"]:
+                # partially read attachments are not cached
+                return chunk
+            # the storage ignores ranges and responds with the whole content, so it's cached and read from the file
+            _write_cache(attach, file, attach_file, BytesContent(chunk))
+
+        with file.open("rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+    return RangeContent(fetch, attach["length"])
+
+
+def _cache_attach_data(attach, context, frame, index, path):
+    file, attach_file = _cache_files(path, frame, index)
+    if not _is_cached(attach, file, attach_file):
+        if "data" not in attach and "download_url" not in attach:
+            # frame metadata lists attachments without data, so it's requested only if it isn't cached
+            attach = context.protocol.attachment(path, context.profile.token, frame, index)
+
+        data = BytesContent(base64.b64decode(attach["data"])) if "data" in attach else \
+            StreamContent(*context.protocol.download(attach["download_url"]))
+        _write_cache(attach, file, attach_file, data)
 
     data = FileContent(file)
     return data
 
 
-# TODO: Support frame and attach_index
+def _write_cache(attach: ty.Dict, file: Path, attach_file: Path, data: Content):
+    # files are written to unique temporary paths and replaced atomically, so concurrent pulls of the same
+    # attachment don't write to the same file, and readers never see a partially written one
+    file.parent.mkdir(parents=True, exist_ok=True)
+    _replace_file(file, lambda tmp: data.to_file(tmp, show_progress=False))
+    # decoders which unpack archives reuse the unpacked directory until the file is replaced
+    shutil.rmtree(unpacked_path(file), ignore_errors=True)
+
+    attach_file.parent.mkdir(parents=True, exist_ok=True)
+    _replace_file(attach_file, lambda tmp: tmp.write_text(json.dumps(attach)))
+
+
+def _replace_file(file: Path, write: ty.Callable[[Path], ty.Any]):
+    tmp = file.with_name(f"{file.name}.{uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, file)
+    finally:
+        if tmp.exists():
+            os.remove(tmp)
+
+
 def pull(stack: str,
          profile: str = "default",
          params: ty.Optional[ty.Dict] = None,
          decoder: ty.Optional[Decoder[ty.Any]] = None,
+         lazy: bool = False,
+         frame: ty.Optional[str] = None,
+         attach_index: ty.Optional[int] = None,
+         chunksize: ty.Optional[int] = None,
+         columns: ty.Optional[ty.List[str]] = None,
+         filters: ty.Optional[ty.List[ty.Tuple[str, str, ty.Any]]] = None,
          **kwargs) -> ty.Any:
-    return _pull(create_context(stack, profile), params, decoder, **kwargs)
+    """Pull an attachment from the stack and decode it.
+
+    Args:
+        stack: A stack you want to pull from.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        params: Parameters of the attachment to pull.
+        decoder: Specify a handler to decode the object, by default `AutoHandler` will be used.
+        lazy: If `True`, return a `LazyFrameData` handle which exposes the attachment metadata right away and
+            downloads and decodes the attachment only on the first access.
+        frame: Identifier of the frame to pull from, see `frames`. By default the head frame is used.
+        attach_index: Index of the attachment in the frame. If it's specified params are ignored.
+        chunksize: Decode tabular data into an iterator over chunks with at most this number of rows.
+            It can't be used together with a custom decoder.
+        columns: Decode only these columns of a data frame. Parquet attachments download only the needed
+            column chunks, other formats are downloaded whole. It can't be used together with a custom decoder.
+        filters: Decode only rows which match all conditions, every condition is a tuple of a column,
+            an operator, e.g. `==`, `<` or `in`, and a value. Parquet row groups which can't match the conditions
+            according to their statistics are not downloaded. It can't be used together with a custom decoder.
+        **kwargs: Parameters is an alternative to params. If both are present this one will be merged into params.
+
+    Returns:
+        Decoded object or a lazy handle.
+    """
+    context = create_context(stack, profile)
+    decoder = _create_decoder(decoder, chunksize=chunksize, columns=columns, filters=filters)
+    ranged = columns is not None or filters is not None
+
+    if lazy:
+        return _pull_lazy(context, params, decoder, ranged, frame=frame, attach_index=attach_index, **kwargs)
+
+    return _pull(context, params, decoder, frame=frame, attach_index=attach_index, ranged=ranged, **kwargs)
+
+
+def frames(stack: str, profile: str = "default", page_size: int = 100) -> ty.Iterator[ty.List[FrameInfo]]:
+    """Page through the frame history of the stack. Frames carry only identifiers, timestamps and params,
+    attachments are not fetched. Any frame can be pulled then with `pull(stack, frame=...)`.
+
+    Args:
+        stack: A stack you want to list.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        page_size: Number of frames in every page.
+
+    Returns:
+        An iterator over pages of frames in the order they were pushed.
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be positive but found {page_size}")
+
+    context = create_context(stack, profile)
+    history = context.protocol.frames(context.stack_path(), context.profile.token)
+
+    return ([FrameInfo(f["id"], f.get("timestamp"), f.get("params")) for f in history[offset:offset + page_size]]
+            for offset in range(0, len(history), page_size))
 
 
 def _pull(context: Context,
           params: ty.Optional[ty.Dict] = None,
           decoder: ty.Optional[Decoder[ty.Any]] = None,
           **kwargs) -> ty.Any:
-    decoder = decoder or AutoHandler()
+    decoder = decoder or _auto_handler()
     decoder.set_context(context)
     return decoder.decode(pull_data(context, params, **kwargs))
 
 
+def _create_decoder(decoder: ty.Optional[Decoder[ty.Any]], **options) -> Decoder[ty.Any]:
+    options = {k: v for k, v in options.items() if v is not None}
+
+    if decoder is None:
+        return _auto_handler(**options)
+
+    if len(options) > 0:
+        raise ValueError(f"{', '.join(options.keys())} can't be used together with a custom decoder")
+
+    return decoder
+
+
+def _pull_lazy(context: Context,
+               params: ty.Optional[ty.Dict] = None,
+               decoder: ty.Optional[Decoder[ty.Any]] = None,
+               ranged: bool = False,
+               **kwargs) -> LazyFrameData:
+    frame, index, attach = _pull_attach(context, params, **kwargs)
+    return _lazy_frame_data(context, frame, index, attach, decoder, ranged)
+
+
+def _lazy_frame_data(context: Context, frame: str, index: int, attach: ty.Dict,
+                     decoder: ty.Optional[Decoder[ty.Any]] = None, ranged: bool = False) -> LazyFrameData:
+    return LazyFrameData(context, frame, index, attach,
+                         loader=lambda: _attach_data(attach, context, frame, index, ranged),
+                         decoder_factory=lambda: decoder or _auto_handler())
+
+
+def pull_frame(stack: str,
+               frame: ty.Optional[str] = None,
+               profile: str = "default",
+               lazy: bool = False,
+               max_workers: ty.Optional[int] = None) -> ty.List[ty.Union[FrameData, LazyFrameData]]:
+    """Pull all attachments of the frame. Frame metadata is fetched once and attachments are downloaded
+    concurrently.
+
+    Args:
+        stack: A stack you want to pull from.
+        frame: Identifier of the frame, see `frames`. By default the head frame is used.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        lazy: If `True`, return `LazyFrameData` handles which download attachments only on the first access.
+        max_workers: Number of concurrent downloads. By default it's limited by the connection pool size
+            of the protocol.
+
+    Returns:
+        Frame data of every attachment in the frame, in the order they were added.
+    """
+    context = create_context(stack, profile)
+    path = context.stack_path()
+    token = context.profile.token
+
+    if frame is None:
+        frame = context.protocol.head(path, token)["head"]["id"]
+
+    attachments = context.protocol.frame(path, token, frame)["attachments"]
+    handles = [_lazy_frame_data(context, frame, index, attach) for index, attach in enumerate(attachments)]
+
+    if lazy or len(handles) == 0:
+        return handles
+
+    max_workers = max_workers or min(len(handles), getattr(context.protocol, "POOL_SIZE", 8))
+    with ThreadPoolExecutor(max_workers) as pool:
+        return list(pool.map(LazyFrameData.data, handles))
+
+
+PullSpec = ty.Union[str, ty.Tuple[str], ty.Tuple[str, ty.Optional[ty.Dict]],
+                    ty.Tuple[str, ty.Optional[ty.Dict], ty.Optional[ty.Dict]]]
+
+
+def pull_many(specs: ty.Iterable[PullSpec],
+              profile: str = "default",
+              decoder_factory: ty.Optional[ty.Callable[[], Decoder[ty.Any]]] = None,
+              max_workers: ty.Optional[int] = None,
+              decode_workers: ty.Optional[int] = None) -> ty.List[PullResult]:
+    """Pull many attachments, possibly from different stacks, at once.
+
+    Metadata is resolved and attachments are downloaded concurrently over a shared connection pool, and every
+    downloaded attachment is decoded in a separate worker pool as soon as it arrives.
+
+    Args:
+        specs: Attachments to pull. Every spec is a tuple `(stack, params, meta)`, where `params` and `meta` can be
+            omitted or `None`, or just a stack name.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        decoder_factory: A function which creates a decoder for every attachment, by default `AutoHandler`
+            will be used. Attachments are decoded concurrently, so every attachment gets its own decoder
+            and its own context.
+        max_workers: Number of concurrent metadata requests and downloads. By default it's limited by
+            the connection pool size of the protocol.
+        decode_workers: Number of concurrent decoders. By default it's the number of CPUs.
+
+    Returns:
+        A list of `PullResult` objects in the same order as `specs`. A failure of a single item doesn't affect
+        others, it's reported in the `error` field of the corresponding result.
+    """
+    specs = [_pull_spec(spec) for spec in specs]
+
+    if len(specs) == 0:
+        return []
+
+    context = create_context(specs[0][0], profile)
+    max_workers = max_workers or min(len(specs), getattr(context.protocol, "POOL_SIZE", 8))
+    decode_workers = decode_workers or min(len(specs), os.cpu_count() or 1)
+
+    def decode(ctx: Context, data: FrameData) -> ty.Any:
+        d = decoder_factory() if decoder_factory is not None else _auto_handler()
+        d.set_context(ctx)
+        return d.decode(data)
+
+    def fetch(ctx: Context, params: ty.Optional[ty.Dict], meta: ty.Optional[ty.Dict]) -> Future:
+        return decode_pool.submit(decode, ctx, pull_data(ctx, params, meta))
+
+    with ThreadPoolExecutor(max_workers) as io_pool, ThreadPoolExecutor(decode_workers) as decode_pool:
+        # identical specs share a single download, so they never write the same cache file concurrently
+        futures = {}
+        for stack, params, meta in specs:
+            key = _pull_spec_key(stack, params, meta)
+            if key not in futures:
+                futures[key] = io_pool.submit(fetch, context.derive(stack), params, meta)
+
+        results = []
+        for stack, params, meta in specs:
+            try:
+                value = futures[_pull_spec_key(stack, params, meta)].result().result()
+                results.append(PullResult(stack, value=value))
+            except Exception as e:
+                results.append(PullResult(stack, error=e))
+
+        return results
+
+
+def _pull_spec(spec: PullSpec) -> ty.Tuple[str, ty.Optional[ty.Dict], ty.Optional[ty.Dict]]:
+    if isinstance(spec, str):
+        return spec, None, None
+
+    spec = tuple(spec)
+
+    if len(spec) == 0 or len(spec) > 3:
+        raise ValueError(f"pull spec must be (stack, params, meta) but found {spec}")
+
+    return spec + (None,) * (3 - len(spec))
+
+
+def _pull_spec_key(stack: str, params: ty.Optional[ty.Dict], meta: ty.Optional[ty.Dict]) -> str:
+    return json.dumps([stack, params, meta], sort_keys=True, default=str)
+
+
+def watch(stack: str,
+          params: ty.Optional[ty.Dict] = None,
+          profile: str = "default",
+          decoder: ty.Optional[Decoder[ty.Any]] = None,
+          callback: ty.Optional[ty.Callable[[ty.Any], None]] = None,
+          interval: float = 5.0,
+          max_interval: float = 60.0,
+          timeout: ty.Optional[float] = None,
+          **kwargs) -> ty.Optional[ty.Iterator[ty.Any]]:
+    """Watch the stack for new frames.
+
+    Only the head of the stack is polled, which costs a single cheap (and conditional if the server supports ETags)
+    request per interval. The attachment is downloaded and decoded only when the head changes.
+
+    Args:
+        stack: A stack you want to watch.
+        params: Parameters of the attachment to pull.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        decoder: Specify a handler to decode the object, by default `AutoHandler` will be used.
+        callback: If specified, it's called with every new object and the call blocks until timeout,
+            otherwise an iterator over new objects is returned.
+        interval: Polling interval in seconds.
+        max_interval: Maximum polling interval in seconds, the interval is doubled up to this value
+            on every failed request and is reset after a successful one.
+        timeout: Stop watching after this number of seconds. By default it watches forever.
+        **kwargs: Parameters is an alternative to params. If both are present this one will be merged into params.
+
+    Returns:
+        An iterator over decoded objects, starting with the current head, if callback is not specified.
+    """
+    iterator = _watch(create_context(stack, profile), merge_or_none(params, kwargs), decoder,
+                      interval, max_interval, timeout)
+
+    if callback is None:
+        return iterator
+
+    for obj in iterator:
+        callback(obj)
+
+    return None
+
+
+def _watch(context: Context,
+           params: ty.Optional[ty.Dict],
+           decoder: ty.Optional[Decoder[ty.Any]],
+           interval: float,
+           max_interval: float,
+           timeout: ty.Optional[float]) -> ty.Iterator[ty.Any]:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    current = None
+    delay = interval
+
+    while deadline is None or time.monotonic() < deadline:
+        try:
+            head = context.protocol.head(context.stack_path(), context.profile.token)["head"]["id"]
+            delay = interval
+        except StackNotFoundError:
+            # stack is not created or doesn't have frames yet
+            head = None
+            delay = interval
+        except IOError:
+            head = None
+            delay = min(delay * 2, max_interval)
+
+        data = None
+        if head is not None and head != current:
+            try:
+                # the frame is pulled by its id, so the stack document isn't downloaded again on every change
+                frame, index, attach = _pull_attach(context, params, frame=head)
+                data = _attach_data(attach, context, frame, index)
+                current = frame
+            except MatchError:
+                # the frame doesn't have the requested attachment, so it's skipped until the head moves again
+                current = head
+            except IOError:
+                # the head is pulled again after the backoff
+                delay = min(delay * 2, max_interval)
+
+        if data is not None:
+            d = decoder or _auto_handler()
+            d.set_context(context)
+            yield d.decode(data)
+        else:
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+
+SEGMENT = "segment"
+APPENDED = "appended"
+COMPACTED = "compacted"
+
+
+def append(stack: str, obj,
+           profile: str = "default",
+           encoder: ty.Optional[Encoder[ty.Any]] = None,
+           compact_every: ty.Optional[int] = None) -> PushResult:
+    """Append rows to the stack. Every call pushes only the new rows as a separate segment, so the cost doesn't
+    grow with the size of the stack. Use `pull_segments` to read all rows.
+
+    Args:
+        stack: A stack you want to append to.
+        obj: A data frame with new rows.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        encoder: Specify a handler to encode the segment, by default `AutoHandler` will be used.
+        compact_every: If specified, segments are compacted by `compact` as soon as there are this many
+            segments since the last compaction.
+
+    Returns:
+        Result of the push.
+    """
+    if compact_every is not None and compact_every < 2:
+        raise ValueError(f"compact_every must be at least 2 but found {compact_every}")
+
+    result = push(stack, obj, meta=FrameMeta({SEGMENT: APPENDED}), encoder=encoder, profile=profile)
+
+    if compact_every is not None:
+        context = create_context(stack, profile)
+        history = context.protocol.frames(context.stack_path(), context.profile.token)
+        if len([f for f in _segment_frames(history) if _segment(f) == APPENDED]) >= compact_every:
+            compact(stack, profile)
+
+    return result
+
+
+def compact(stack: str, profile: str = "default", format: str = "parquet") -> ty.Optional[PushResult]:
+    """Concatenate segments of an append-only stack and push them as a single columnar frame. Segments which are
+    appended while compaction is in progress are kept, they follow the compacted frame.
+
+    Args:
+        stack: A stack you want to compact.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        format: Storage format of the compacted frame, see `DataFrameEncoder`.
+
+    Returns:
+        Result of the push or `None` if there are no segments to compact.
+    """
+    from dstack.pandas.handlers import DataFrameEncoder
+
+    context = create_context(stack, profile)
+    history = context.protocol.frames(context.stack_path(), context.profile.token)
+    frames = _segment_frames(history)
+
+    if len([f for f in frames if _segment(f) == APPENDED]) == 0:
+        return None
+
+    df = _segments(context, frames).value()
+    meta = FrameMeta({SEGMENT: COMPACTED, "last": frames[-1]["id"], "rows": len(df)})
+    return push(stack, df, meta=meta, encoder=DataFrameEncoder(format=format), profile=profile)
+
+
+def pull_segments(stack: str, profile: str = "default",
+                  decoder: ty.Optional[Decoder[ty.Any]] = None) -> Segments:
+    """Pull an append-only stack, see `append`. Only metadata of segments is fetched, segments are downloaded
+    and decoded when they are iterated over or concatenated with `Segments.value`.
+
+    Args:
+        stack: A stack you want to pull from.
+        profile: Profile you want to use, i.e. username and token. Default profile is 'default'.
+        decoder: Specify a handler to decode segments, by default `AutoHandler` will be used.
+
+    Returns:
+        Segments since the last compaction, the compacted frame goes first.
+    """
+    context = create_context(stack, profile)
+    history = context.protocol.frames(context.stack_path(), context.profile.token)
+    return _segments(context, _segment_frames(history), decoder)
+
+
+def _segment(f: ty.Dict) -> ty.Optional[str]:
+    return (f.get("params") or {}).get(SEGMENT)
+
+
+def _segment_frames(history: ty.List[ty.Dict]) -> ty.List[ty.Dict]:
+    compacted = [i for i, f in enumerate(history) if _segment(f) == COMPACTED]
+
+    if len(compacted) == 0:
+        return [f for f in history if _segment(f) == APPENDED]
+
+    base = history[compacted[-1]]
+    ids = [f["id"] for f in history]
+    last = base["params"].get("last")
+    # segments appended during compaction are pushed before the compacted frame but aren't included into it
+    start = ids.index(last) + 1 if last in ids else compacted[-1]
+    return [base] + [f for f in history[start:] if _segment(f) == APPENDED]
+
+
+def _segments(context: Context, frames: ty.List[ty.Dict], decoder: ty.Optional[Decoder[ty.Any]] = None) -> Segments:
+    path = context.stack_path()
+    token = context.profile.token
+
+    def handle(f: ty.Dict) -> LazyFrameData:
+        attach = context.protocol.frame(path, token, f["id"])["attachments"][0]
+        return _lazy_frame_data(context, f["id"], 0, attach, decoder)
+
+    if len(frames) == 0:
+        return Segments([])
+
+    with ThreadPoolExecutor(min(len(frames), getattr(context.protocol, "POOL_SIZE", 8))) as pool:
+        return Segments(list(pool.map(handle, frames)))
+
+
 # TODO: Make it protected. Move config to pull
 def create_context(stack: str, profile: str = "default", config: ty.Optional[Config] = None) -> Context:
     profile = (config or get_config()).get_profile(profile)
@@ -5,8 +5,6 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from types import ModuleType
 
-from pkg_resources import get_distribution
-
 
 class NoSuchModuleError(ValueError):
     def __init__(self, module: str):
@@ -179,4 +177,5 @@ class ProjectDependency(Dependency):
 
 
 def _specify_package_version_if_needed(package: str) -> str:
+    from pkg_resources import get_distribution
     return package if "==" in package else f"{package}=={get_distribution(package).version}"
@@ -3,8 +3,6 @@ import typing as ty
 from pathlib import Path
 from tempfile import gettempdir
 
-import cloudpickle
-
 import dstack.util as util
 from dstack.handler import EncoderFactory, Encoder, FrameData
 from dstack.controls import Controller, Container
@@ -44,6 +42,7 @@ class AppEncoder(Encoder['Application']):
         archived = util.create_filename(self._temp_dir)
         filename = shutil.make_archive(archived, self._archive, stage_dir)
 
+        import cloudpickle
         settings = {"cloudpickle": cloudpickle.__version__, "archive": self._archive}
 
         return FrameData(FileContent(Path(filename)),
@@ -52,6 +51,7 @@ class AppEncoder(Encoder['Application']):
 
 
 def _serialize(obj: ty.Any, path: Path):
+    import cloudpickle
     with path.open(mode="wb") as f:
         cloudpickle.dump(obj, f)
 
@@ -0,0 +1,22 @@
+from typing import Any
+
+from dstack.content import MediaType
+from dstack.handler import EncoderFactory, Encoder, DecoderFactory, Decoder
+
+
+class ArrowEncoderFactory(EncoderFactory):
+    def accept(self, obj: Any) -> bool:
+        return self.is_type(obj, "pyarrow.lib.Table") or self.is_type(obj, "pyarrow.lib.RecordBatch")
+
+    def create(self) -> Encoder:
+        from dstack.arrow.handlers import ArrowEncoder
+        return ArrowEncoder()
+
+
+class ArrowDecoderFactory(DecoderFactory):
+    def accept(self, obj: MediaType) -> bool:
+        return self.is_media(obj.application, ["arrow/table", "arrow/record_batch"])
+
+    def create(self, **options) -> Decoder:
+        from dstack.arrow.handlers import ArrowDecoder
+        return ArrowDecoder(**options)
@@ -0,0 +1,70 @@
+from typing import Optional, Dict, Union
+
+import pyarrow as pa
+
+from dstack.content import MediaType, FileContent, SpooledContent
+from dstack.handler import Encoder, Decoder
+from dstack.stack import FrameData
+
+CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+ArrowData = Union[pa.Table, pa.RecordBatch]
+
+
+class ArrowEncoder(Encoder[ArrowData]):
+    """An encoder which writes tables and record batches in the Arrow IPC stream format as they are,
+    without conversion to pandas."""
+
+    def __init__(self, compression: Optional[str] = None):
+        """Create an encoder.
+
+        Args:
+            compression: Compression codec of buffers, `lz4` or `zstd`. Compressed buffers can't be
+                read without copying, so there is no compression by default.
+        """
+        super().__init__()
+        self.compression = compression
+
+    def encode(self, obj: ArrowData, description: Optional[str], params: Optional[Dict]) -> FrameData:
+        content = SpooledContent()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+
+        with pa.ipc.new_stream(content.file, obj.schema, options=options) as writer:
+            if isinstance(obj, pa.Table):
+                writer.write_table(obj)
+            else:
+                writer.write_batch(obj)
+
+        application = "arrow/table" if isinstance(obj, pa.Table) else "arrow/record_batch"
+        settings = {"schema": [{"name": f.name, "type": str(f.type)} for f in obj.schema],
+                    "rows": obj.num_rows,
+                    "compression": self.compression,
+                    "pyarrow": pa.__version__}
+
+        return FrameData(content, MediaType(CONTENT_TYPE, application), description, params, settings)
+
+
+class ArrowDecoder(Decoder[ArrowData]):
+    def __init__(self, mmap: bool = True):
+        """Create a decoder.
+
+        Args:
+            mmap: Memory map the pull cache file, so uncompressed record batches reference the file
+                instead of being copied into memory.
+        """
+        super().__init__()
+        self.mmap = mmap
+
+    def decode(self, data: FrameData) -> ArrowData:
+        if self.mmap and isinstance(data.data, FileContent):
+            source = pa.memory_map(str(data.data.filename))
+        else:
+            source = pa.BufferReader(data.data.value())
+
+        reader = pa.ipc.open_stream(source)
+
+        if data.application == "arrow/record_batch":
+            # a record batch is written as a single batch of the stream
+            return reader.read_next_batch()
+
+        return reader.read_all()
@@ -1,13 +1,20 @@
-from typing import Optional, Dict, Any, List, TypeVar
+import inspect
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, TypeVar, Tuple
 
+from dstack.arrow import ArrowEncoderFactory, ArrowDecoderFactory
 from dstack.bokeh import BokehEncoderFactory
+from dstack.content import MediaType
 from dstack.files import FileEncoderFactory
 from dstack.geopandas import GeoDataFrameEncoderFactory, GeoDataFrameDecoderFactory
-from dstack.handler import FrameData, Encoder, Decoder, AbstractFactory
+from dstack.handler import FrameData, Encoder, Decoder, AbstractFactory, EncoderFactory, DecoderFactory, \
+    _mro_names
 from dstack.md import MarkdownEncoderFactory
+from dstack.numpy import NdArrayEncoderFactory, NdArrayDecoderFactory
 from dstack.matplotlib import MatplotlibEncoderFactory
 from dstack.pandas import DataFrameEncoderFactory, DataFrameDecoderFactory, SeriesDecoderFactory, \
-    GeneralCsvDecoderFactory, SeriesEncoderFactory
+    GeneralCsvDecoderFactory, SeriesEncoderFactory, RowsEncoderFactory
 from dstack.plotly import PlotlyEncoderFactory
 from dstack.sklearn import SklearnModelEncoderFactory, SklearnModelDecoderFactory
 from dstack.tensorflow import TensorFlowKerasModelDecoderFactory, TensorFlowKerasModelEncoderFactory
@@ -26,34 +33,227 @@ T = TypeVar("T")
 S = TypeVar("S")
 
 
+ENCODERS_GROUP = "dstack.encoders"
+DECODERS_GROUP = "dstack.decoders"
+
+
+class Registration(object):
+    """A factory in an index. A factory which is discovered through an entry point is imported only when
+    an object of its type or data of its media type shows up."""
+
+    def __init__(self, rank: int, factory: Optional[AbstractFactory] = None,
+                 priority: Optional[int] = None, entry_point: Optional[Any] = None):
+        self.rank = rank
+        self.entry_point = entry_point
+        self._factory = factory
+        self._priority = priority
+
+    def factory(self) -> AbstractFactory:
+        if self._factory is None:
+            self._factory = self.entry_point.load()()
+        return self._factory
+
+    def priority(self) -> int:
+        # plugins declare their priority with a `priority` attribute of the factory
+        return self._priority if self._priority is not None else getattr(self.factory(), "priority", 0)
+
+    def is_plugin(self) -> bool:
+        return self.entry_point is not None
+
+
+class FactoryIndex(ABC):
+    """Factories ordered by priority. Factories with the same priority are ordered as follows:
+    explicitly registered ones, latest first, then plugins discovered through entry points of the group,
+    and then built-in factories in their order."""
+
+    def __init__(self, factories: List[AbstractFactory], group: str):
+        self.group = group
+        self.builtins = [Registration(2 * 10 ** 6 + i, f, 0) for i, f in enumerate(factories)]
+        self.registered: List[Registration] = []
+        self.plugins: Optional[List[Registration]] = None
+        self.lock = threading.Lock()
+
+    @property
+    def factories(self) -> List[AbstractFactory]:
+        return [r.factory() for r in self.registered + self.builtins]
+
+    def register(self, factory: AbstractFactory, priority: int = 0):
+        with self.lock:
+            self.registered.append(Registration(-len(self.registered), factory, priority))
+            self.clear()
+
+    def registrations(self) -> List[Registration]:
+        if self.plugins is None:
+            with self.lock:
+                if self.plugins is None:
+                    self.plugins = [Registration(10 ** 6 + i, entry_point=ep)
+                                    for i, ep in enumerate(_entry_points(self.group))]
+        return self.registered + self.plugins + self.builtins
+
+    def ordered(self, registrations: List[Registration]) -> List[AbstractFactory]:
+        return [r.factory() for r in sorted(registrations, key=lambda r: (-r.priority(), r.rank))]
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class EncoderIndex(FactoryIndex):
+    """Encoder factories indexed by object types, so a factory is selected without checking every factory
+    for every object. Entry points of plugins are named after fully qualified names of types they encode,
+    e.g. `mylib.models.Model = mylib.dstack:ModelEncoderFactory`, subclasses are matched as well."""
+
+    def __init__(self, factories: List[EncoderFactory], group: str = ENCODERS_GROUP):
+        super().__init__(factories, group)
+        self.by_type: Dict[type, List[EncoderFactory]] = {}
+
+    def find(self, obj: Any) -> EncoderFactory:
+        candidates = self.by_type.get(type(obj))
+
+        if candidates is None:
+            names = _mro_names(type(obj))
+            registrations = [r for r in self.registrations()
+                             if not r.is_plugin() or f"<class '{r.entry_point.name}'>" in names]
+            # factories which accept any object of the type are checked once per type,
+            # the rest of factories are kept to check every object
+            candidates = [f for f in self.ordered(registrations) if not f.by_type() or f.accept(obj)]
+            self.by_type[type(obj)] = candidates
+
+        for factory in candidates:
+            if factory.by_type() or factory.accept(obj):
+                return factory
+
+        raise UnsupportedObjectTypeException(obj)
+
+    def clear(self):
+        self.by_type = {}
+
+
+class DecoderIndex(FactoryIndex):
+    """Decoder factories indexed by media types. Entry points of plugins are named after applications or
+    content types they decode, e.g. `mylib/model = mylib.dstack:ModelDecoderFactory`."""
+
+    def __init__(self, factories: List[DecoderFactory], group: str = DECODERS_GROUP):
+        super().__init__(factories, group)
+        self.by_media: Dict[Tuple[str, Optional[str]], DecoderFactory] = {}
+
+    def find(self, media_type: MediaType) -> DecoderFactory:
+        key = (media_type.content_type, media_type.application)
+        factory = self.by_media.get(key)
+
+        if factory is None:
+            registrations = [r for r in self.registrations()
+                             if not r.is_plugin() or r.entry_point.name in key]
+            factory = AutoHandler.find_factory(media_type, self.ordered(registrations))
+            self.by_media[key] = factory
+
+        return factory
+
+    def clear(self):
+        self.by_media = {}
+
+
+def _create_decoder(factory: DecoderFactory, media_type: MediaType, options: Dict[str, Any]) -> Decoder:
+    def unsupported(names: List[str]) -> ValueError:
+        return ValueError(f"{', '.join(names)} can't be used to decode {media_type.content_type} "
+                          f"({media_type.application})")
+
+    parameters = inspect.signature(factory.create).parameters
+    if not any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        names = [name for name in options if name not in parameters]
+        if len(names) > 0:
+            raise unsupported(names)
+
+    try:
+        return factory.create(**options)
+    except TypeError as e:
+        # factories which pass options through to decoders don't declare them
+        raise unsupported(list(options)) from e
+
+
+def _entry_points(group: str) -> List[Any]:
+    # importlib.metadata appeared in Python 3.8, older versions fall back to the backport or setuptools
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            try:
+                from pkg_resources import iter_entry_points
+            except ImportError:
+                return []
+            return list(iter_entry_points(group))
+
+    eps = entry_points()
+    return list(eps.select(group=group)) if hasattr(eps, "select") else list(eps.get(group, []))
+
+
+ENCODERS = EncoderIndex([
+    MarkdownEncoderFactory(),
+    MatplotlibEncoderFactory(),
+    PlotlyEncoderFactory(),
+    BokehEncoderFactory(),
+    DataFrameEncoderFactory(),
+    SeriesEncoderFactory(),
+    RowsEncoderFactory(),
+    NdArrayEncoderFactory(),
+    ArrowEncoderFactory(),
+    SklearnModelEncoderFactory(),
+    TorchModelEncoderFactory(),
+    TensorFlowKerasModelEncoderFactory(),
+    GeoDataFrameEncoderFactory(),
+    FileEncoderFactory(),
+    AppEncoderFactory()])
+
+DECODERS = DecoderIndex([
+    DataFrameDecoderFactory(),
+    SeriesDecoderFactory(),
+    GeneralCsvDecoderFactory(),
+    NdArrayDecoderFactory(),
+    ArrowDecoderFactory(),
+    SklearnModelDecoderFactory(),
+    TorchModelDecoderFactory(),
+    TensorFlowKerasModelDecoderFactory(),
+    GeoDataFrameDecoderFactory()])
+
+
+def register_encoder(factory: EncoderFactory, priority: int = 0):
+    """Register an encoder factory, so `AutoHandler` uses it to encode objects it accepts.
+
+    Args:
+        factory: An encoder factory.
+        priority: Factories with higher priority are checked first. Built-in factories have zero priority,
+            and a registered factory overrides built-in ones and plugins with the same priority.
+    """
+    ENCODERS.register(factory, priority)
+
+
+def register_decoder(factory: DecoderFactory, priority: int = 0):
+    """Register a decoder factory, so `AutoHandler` uses it to decode data it accepts.
+
+    Args:
+        factory: A decoder factory.
+        priority: Factories with higher priority are checked first. Built-in factories have zero priority,
+            and a registered factory overrides built-in ones and plugins with the same priority.
+    """
+    DECODERS.register(factory, priority)
+
+
 class AutoHandler(Encoder[Any], Decoder[Any]):
-    """A handler which selects appropriate implementation depending on `obj` itself in runtime."""
+    """A handler which selects appropriate implementation depending on `obj` itself in runtime.
+    Factories are shared by all handlers, so creating a handler is cheap."""
+
+    def __init__(self, **options):
+        """Create a handler.
 
-    def __init__(self):
+        Args:
+            **options: Options passed to the decoder selected for the data, e.g. `chunksize` for pandas decoders.
+        """
         super().__init__()
-        self.encoders = [
-            MarkdownEncoderFactory(),
-            MatplotlibEncoderFactory(),
-            PlotlyEncoderFactory(),
-            BokehEncoderFactory(),
-            DataFrameEncoderFactory(),
-            SeriesEncoderFactory(),
-            SklearnModelEncoderFactory(),
-            TorchModelEncoderFactory(),
-            TensorFlowKerasModelEncoderFactory(),
-            GeoDataFrameEncoderFactory(),
-            FileEncoderFactory(),
-            AppEncoderFactory()]
-
-        self.decoders = [
-            DataFrameDecoderFactory(),
-            SeriesDecoderFactory(),
-            GeneralCsvDecoderFactory(),
-            SklearnModelDecoderFactory(),
-            TorchModelDecoderFactory(),
-            TensorFlowKerasModelDecoderFactory(),
-            GeoDataFrameDecoderFactory()
-        ]
+        self.options = options
+        self.encoders = ENCODERS
+        self.decoders = DECODERS
 
     def encode(self, obj: Any, description: Optional[str], params: Optional[Dict]) -> FrameData:
         """Create frame data from any known object.
@@ -69,17 +269,37 @@ class AutoHandler(Encoder[Any], Decoder[Any]):
         Raises:
             UnsupportedObjectTypeException: In the case of unknown object type.
         """
-        handler = self.find_handler(obj, self.encoders)
+        handler = self.encoders.find(obj).create()
         handler.set_context(self._context)
         return handler.encode(obj, description, params)
 
     def decode(self, data: FrameData) -> Any:
-        return self.find_handler(data.media_type(), self.decoders).decode(data)
+        """Decode frame data of any known media type.
+
+        Args:
+            data: Frame data.
+
+        Returns:
+            A decoded object.
+
+        Raises:
+            UnsupportedObjectTypeException: In the case of unknown media type.
+            ValueError: If the decoder of the media type doesn't support some of the options.
+        """
+        media_type = data.media_type()
+        factory = self.decoders.find(media_type)
+        decoder = _create_decoder(factory, media_type, self.options) if self.options else factory.create()
+        decoder.set_context(self._context)
+        return decoder.decode(data)
 
     @staticmethod
     def find_handler(obj: T, chain: List[AbstractFactory[T, S]]) -> S:
+        return AutoHandler.find_factory(obj, chain).create()
+
+    @staticmethod
+    def find_factory(obj: T, chain: List[AbstractFactory[T, S]]) -> AbstractFactory[T, S]:
         for factory in chain:
             if factory.accept(obj):
-                return factory.create()
+                return factory
 
         raise UnsupportedObjectTypeException(obj)
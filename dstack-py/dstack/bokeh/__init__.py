@@ -6,7 +6,8 @@ from dstack.handler import Encoder, EncoderFactory
 class BokehEncoderFactory(EncoderFactory):
 
     def accept(self, obj: Any) -> bool:
-        return self.is_type(obj, "bokeh.plotting.figure.Figure")
+        # Bokeh 3 renamed the class of figures
+        return self.is_type(obj, "bokeh.plotting.figure.Figure") or self.is_type(obj, "bokeh.plotting._figure.figure")
 
     def create(self) -> Encoder:
         from dstack.bokeh.handlers import BokehEncoder
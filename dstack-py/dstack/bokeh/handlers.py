@@ -1,11 +1,16 @@
 from json import dumps
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple, Any
 
 from bokeh import __version__ as bokeh_version
 from bokeh.embed import json_item
-from bokeh.plotting import Figure
 
-from dstack import BytesContent, Encoder
+try:
+    from bokeh.plotting import Figure
+except ImportError:
+    # Bokeh 3 renamed the class of figures
+    from bokeh.plotting import figure as Figure
+
+from dstack import BytesContent, Encoder, downsampling
 from dstack.content import MediaType
 from dstack.stack import FrameData
 
@@ -16,6 +21,19 @@ class BokehEncoder(Encoder[Figure]):
         In the settings section it stores Bokeh library version as `bokeh_version`.
     """
 
+    def __init__(self, max_points: Optional[int] = None, method: str = downsampling.LTTB):
+        """Create an encoder.
+
+        Args:
+            max_points: Downsample column data sources of glyphs with more points than this, e.g. a few times
+                the width of the plot in pixels. By default sources are not downsampled.
+            method: Downsampling method, `lttb` or `minmax`, see `dstack.downsampling.downsample`.
+        """
+        super().__init__()
+        downsampling.check(max_points, method)
+        self.max_points = max_points
+        self.method = method
+
     def encode(self, obj: Figure, description: Optional[str], params: Optional[Dict]) -> FrameData:
         """Convert Bokeh figure to frame data.
 
@@ -27,7 +45,52 @@ class BokehEncoder(Encoder[Figure]):
         Returns:
             Frame data.
         """
-        text = dumps(json_item(obj))
+        settings = {"bokeh_version": bokeh_version}
+        replaced = []
+        try:
+            if self.max_points is not None:
+                points, kept = self._downsample(obj, replaced)
+                settings["downsampling"] = downsampling.settings(self.method, points, kept)
+            text = dumps(json_item(obj))
+        finally:
+            # sources are downsampled only while the figure is serialized, so the figure stays as it was
+            for source, data in replaced:
+                source.data = data
+
         return FrameData(BytesContent(text.encode("utf-8")),
                          MediaType("application/json", "bokeh"),
-                         description, params, {"bokeh_version": bokeh_version})
+                         description, params, settings)
+
+    def _downsample(self, obj: Figure, replaced: List[Tuple[Any, Dict]]) -> Tuple[List[int], List[int]]:
+        from bokeh.models import ColumnDataSource, GlyphRenderer
+        import numpy as np
+
+        points, kept = [], []
+        for renderer in obj.renderers:
+            if not isinstance(renderer, GlyphRenderer) or not isinstance(renderer.data_source, ColumnDataSource):
+                continue
+            source = renderer.data_source
+            x, y = _field(getattr(renderer.glyph, "x", None)), _field(getattr(renderer.glyph, "y", None))
+            if any(s is source for s, _ in replaced) or y not in source.data:
+                continue
+            n = len(source.data[y])
+            if n <= self.max_points:
+                continue
+            indices = downsampling.downsample(source.data.get(x), source.data[y], self.max_points, self.method)
+            if indices is not None:
+                data = dict(source.data)
+                source.data = {k: np.asarray(v)[indices] for k, v in data.items()}
+                replaced.append((source, data))
+                points.append(n)
+                kept.append(len(indices))
+
+        return points, kept
+
+
+def _field(spec) -> Optional[str]:
+    # a glyph property which refers to a column is either a column name or a field specification
+    if isinstance(spec, str):
+        return spec
+    if isinstance(spec, dict):
+        return spec.get("field")
+    return getattr(spec, "field", None)
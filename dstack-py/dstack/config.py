@@ -4,8 +4,6 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional, Dict, Union
 
-import yaml
-
 API_SERVER = "https://stgn.dstack.cloud/api"
 
 
@@ -213,6 +211,7 @@ class YamlConfig(DictionaryBasedConfig):
     def save(self):
         if not self.path.parent.exists():
             self.path.parent.mkdir(parents=True)
+        import yaml
         content = yaml.dump(self.yaml_data)
         self.path.write_text(content, encoding="utf-8")
 
@@ -289,6 +288,15 @@ def _get_config_path(path: Optional[str] = None, check_local: bool = False) -> P
     return path or env or config_path
 
 
+def get_cache_dir() -> Path:
+    """Get the directory of the pull cache, which is next to the configuration file.
+
+    Returns:
+        A path to the directory.
+    """
+    return _get_config_path().parent / "cache"
+
+
 def from_yaml_file(path: Path, error_if_not_exist: bool = False) -> Config:
     """Load YAML configuration.
 
@@ -308,6 +316,8 @@ def from_yaml_file(path: Path, error_if_not_exist: bool = False) -> Config:
         else:
             return YamlConfig({}, path)
 
+    import yaml
+
     with path.open() as f:
         return YamlConfig(yaml.load(f, Loader=yaml.FullLoader), path)
 
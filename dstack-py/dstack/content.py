@@ -1,15 +1,15 @@
 import base64
 import io
+import tempfile
 from abc import ABC, abstractmethod
 from pathlib import Path
 from types import TracebackType
-from typing import IO, Union, Optional, Iterable, Type, AnyStr, Iterator, List
-
-import tqdm
+from typing import IO, Union, Optional, Iterable, Type, AnyStr, Iterator, List, Callable
 
 
 class Progress(object):
     def __init__(self, total: int, desc: Optional[str] = None):
+        import tqdm
         self.progress = tqdm.tqdm(total=total, unit="B", unit_scale=True)
         self.progress.set_description(desc)
 
@@ -175,6 +175,96 @@ class StreamContent(AbstractStreamContent):
         return self.input_stream
 
 
+class SpooledContent(Content):
+    """Content which is written in parts. It's kept in memory until it grows over the limit
+    and then it's moved to a temporary file."""
+
+    MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, max_memory_size: int = MAX_MEMORY_SIZE):
+        # writers which need a file object, e.g. `pyarrow`, can write to the file directly
+        self.file = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+
+    def write(self, b: bytes) -> int:
+        self.file.seek(0, io.SEEK_END)
+        return self.file.write(b)
+
+    def length(self) -> int:
+        return self.file.seek(0, io.SEEK_END)
+
+    def stream(self) -> IO:
+        self.file.seek(0)
+        return self.file
+
+    def value(self) -> bytes:
+        return self.stream().read()
+
+
+class RangeStream(io.RawIOBase):
+    """A seekable read-only stream which fetches only requested byte ranges of remote content."""
+
+    def __init__(self, fetch: Callable[[int, int], bytes], content_length: int):
+        """Create a stream.
+
+        Args:
+            fetch: A function which returns bytes from the first offset to the second one inclusively.
+            content_length: Total length of the content.
+        """
+        super().__init__()
+        self.fetch = fetch
+        self.content_length = content_length
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.content_length + offset
+        else:
+            raise ValueError(f"Unsupported whence {whence}")
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self.content_length - self.position)
+
+        if n <= 0:
+            return 0
+
+        chunk = self.fetch(self.position, self.position + n - 1)
+        b[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+
+class RangeContent(AbstractStreamContent):
+    """Remote content which is read by byte ranges, so readers of seekable formats, e.g. Parquet,
+    download only the parts they need."""
+
+    BUFFER_SIZE = 16384
+
+    def __init__(self, fetch: Callable[[int, int], bytes], content_length: int):
+        super().__init__()
+        self.fetch = fetch
+        self.content_length = content_length
+
+    def length(self) -> int:
+        return self.content_length
+
+    def stream(self) -> IO:
+        return io.BufferedReader(RangeStream(self.fetch, self.content_length), self.BUFFER_SIZE)
+
+
 class FileContent(AbstractStreamContent):
     def __init__(self, filename: Path):
         super().__init__()
@@ -0,0 +1,139 @@
+from typing import Optional, List, Dict, Any
+
+import numpy as np
+
+LTTB = "lttb"
+MINMAX = "minmax"
+METHODS = [LTTB, MINMAX]
+
+
+def check(max_points: Optional[int], method: str):
+    """Check downsampling options of an encoder.
+
+    Args:
+        max_points: Maximum number of points of a trace or None if traces are not downsampled.
+        method: Downsampling method.
+
+    Raises:
+        ValueError: If options are invalid.
+    """
+    if max_points is not None and max_points < 3:
+        raise ValueError(f"max_points must be at least 3, got {max_points}")
+    if method not in METHODS:
+        raise ValueError(f"Unsupported downsampling method: {method}, supported methods are {', '.join(METHODS)}")
+
+
+def downsample(x: Any, y: Any, n: int, method: str = LTTB) -> Optional[np.ndarray]:
+    """Select points of a trace which keep its visual shape.
+
+    Args:
+        x: X values, numeric or datetime. If it's None or of other type, points are assumed to be evenly spaced.
+        y: Y values.
+        n: Number of points to select.
+        method: `lttb`, i.e. Largest-Triangle-Three-Buckets, which selects exactly `n` points, or `minmax`,
+            which selects minimum and maximum of `n / 2` buckets, and is faster but keeps up to 4 more points.
+
+    Returns:
+        Sorted indices of selected points, or None if y values are not numeric.
+    """
+    y = _numeric(y)
+    if y is None:
+        return None
+    if len(y) <= n:
+        return np.arange(len(y))
+
+    if method == MINMAX:
+        return minmax(y, n)
+
+    x = _numeric(x) if x is not None else None
+    if x is None or len(x) != len(y):
+        x = np.arange(len(y), dtype=np.float64)
+    return lttb(x, y, n)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Select points with Largest-Triangle-Three-Buckets. The first and the last points are kept, and other points
+    are divided into `n - 2` buckets. Every bucket keeps the point which makes the largest triangle with the point
+    kept in the previous bucket and the average of the next bucket. Buckets are processed in turn, but every
+    bucket is processed with array operations.
+
+    Args:
+        x: Float x values.
+        y: Float y values.
+        n: Number of points to select, less than the number of values.
+
+    Returns:
+        Sorted indices of selected points.
+    """
+    edges = np.linspace(1, len(y) - 1, n - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # the last value isn't a part of any bucket, so it's excluded from sums
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n, dtype=np.int64)
+    selected[0] = a = 0
+    selected[-1] = len(y) - 1
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax(y: np.ndarray, n: int) -> np.ndarray:
+    """Select minimum and maximum values of `n / 2` buckets with the same number of points, and the first and
+    the last points. Missing values are selected only if a bucket has no other values.
+
+    Args:
+        y: Float y values.
+        n: Number of points to select, less than the number of values.
+
+    Returns:
+        Sorted indices of selected points.
+    """
+    buckets = max(n // 2, 1)
+    size = len(y) // buckets
+    body = buckets * size
+    nan = np.isnan(y)
+    low = np.where(nan, np.inf, y)
+    high = np.where(nan, -np.inf, y)
+
+    starts = np.arange(0, body, size)
+    indices = [low[:body].reshape(buckets, size).argmin(axis=1) + starts,
+               high[:body].reshape(buckets, size).argmax(axis=1) + starts,
+               [0, len(y) - 1]]
+    if body < len(y):
+        indices.append([body + low[body:].argmin(), body + high[body:].argmax()])
+
+    return np.unique(np.concatenate(indices))
+
+
+def settings(method: str, points: List[int], kept: List[int]) -> Dict:
+    """Describe downsampling for settings of frame data.
+
+    Args:
+        method: Downsampling method.
+        points: Original numbers of points of downsampled traces.
+        kept: Numbers of points which are kept.
+
+    Returns:
+        The method, numbers of points and the ratio of original points to kept points.
+    """
+    return {"method": method, "points": points, "kept": kept,
+            "ratio": sum(points) / sum(kept) if kept else 1.0}
+
+
+def _numeric(a: Any) -> Optional[np.ndarray]:
+    a = np.asarray(a)
+    if a.ndim != 1:
+        return None
+    if a.dtype.kind in "biuf":
+        return a.astype(np.float64, copy=False)
+    if a.dtype.kind in "mM":
+        return a.view(np.int64).astype(np.float64)
+    return None
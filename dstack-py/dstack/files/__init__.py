@@ -8,6 +8,9 @@ class FileEncoderFactory(EncoderFactory):
     def accept(self, obj: Any) -> bool:
         return isinstance(obj, Path) and not obj.is_dir()
 
+    def by_type(self) -> bool:
+        return False
+
     def create(self) -> Encoder:
         from dstack.files.handlers import FileEncoder
         return FileEncoder()
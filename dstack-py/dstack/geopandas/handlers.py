@@ -6,8 +6,10 @@ from uuid import uuid4
 
 from geopandas import GeoDataFrame, read_file
 
+from dstack.config import get_cache_dir
 from dstack.content import MediaType, FileContent, CONTENT_TYPE_MAP_REVERSED
 from dstack.handler import Encoder, FrameData, Decoder
+from dstack.util import unpack_archive
 
 
 class GeoDataFrameEncoder(Encoder[GeoDataFrame]):
@@ -40,25 +42,18 @@ class GeoDataFrameEncoder(Encoder[GeoDataFrame]):
 
 class GeoDataFrameDecoder(Decoder[GeoDataFrame]):
     def __init__(self, temp: Optional[Path] = None):
+        """Create a decoder.
+
+        Args:
+            temp: A directory for data which is not in the pull cache, the pull cache by default.
+        """
         super().__init__()
-        self.temp = temp or Path(tempfile.mkdtemp())
+        self.temp = temp or get_cache_dir() / "geopandas"
 
     def decode(self, data: FrameData) -> GeoDataFrame:
         file = self.save_data(data)
         return read_file(file / "data.shp")
 
     def save_data(self, data: FrameData) -> Path:
-        filename = self._create_filename()
-
-        with filename.open("wb") as f:
-            f.write(data.data.stream().read())
-
-        archive = data.settings["archive"]
-
-        unpacked = self._create_filename()
-        shutil.unpack_archive(str(filename), extract_dir=str(unpacked), format=archive)
-        return unpacked
-
-    def _create_filename(self) -> Path:
-        return self.temp / str(uuid4())
-
+        # data is unpacked once and the directory is reused by later pulls of the same frame
+        return unpack_archive(data.data, data.settings["archive"], self.temp)
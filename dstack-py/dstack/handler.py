@@ -1,6 +1,7 @@
 import inspect
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, TypeVar, Generic, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, TypeVar, Generic, List, FrozenSet
 
 from dstack.content import Content, MediaType
 from dstack.context import ContextAwareObject
@@ -90,15 +91,28 @@ class AbstractFactory(Generic[T, S], ABC):
 
 
 class EncoderFactory(AbstractFactory[Any, Encoder], ABC):
+    def by_type(self) -> bool:
+        """Check if `accept` depends only on the type of the object, so its result can be cached by type.
+
+        Returns:
+            `True` unless the factory inspects the object itself.
+        """
+        return True
+
     @staticmethod
     def has_type(obj: Any, tpe: str) -> bool:
-        return f"<class '{tpe}'>" in map(lambda x: str(x), inspect.getmro(obj.__class__))
+        return f"<class '{tpe}'>" in _mro_names(obj.__class__)
 
     @staticmethod
     def is_type(obj: Any, tpe: str) -> bool:
         return str(type(obj)) == f"<class '{tpe}'>"
 
 
+@lru_cache(maxsize=1024)
+def _mro_names(cls: type) -> FrozenSet[str]:
+    return frozenset(str(c) for c in inspect.getmro(cls))
+
+
 class DecoderFactory(AbstractFactory[MediaType, Decoder], ABC):
     @staticmethod
     def is_media(obj: str, media: List[str]):
@@ -0,0 +1,183 @@
+import threading
+import typing as ty
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from dstack.content import MediaType
+from dstack.context import Context
+from dstack.handler import FrameData, Decoder
+
+_PREFETCH_WORKERS = 4
+_prefetch_pool: ty.Optional[ThreadPoolExecutor] = None
+_prefetch_lock = threading.Lock()
+
+
+def _get_prefetch_pool() -> ThreadPoolExecutor:
+    global _prefetch_pool
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(_PREFETCH_WORKERS, thread_name_prefix="dstack-prefetch")
+        return _prefetch_pool
+
+
+class LazyFrameData(object):
+    """A handle to a pulled attachment which exposes its metadata right away, but downloads and decodes
+    the attachment only on the first access. Both the downloaded data and the decoded object are memoized.
+    """
+
+    def __init__(self, context: Context,
+                 frame: str,
+                 index: int,
+                 attach: ty.Dict,
+                 loader: ty.Callable[[], FrameData],
+                 decoder_factory: ty.Callable[[], Decoder[ty.Any]]):
+        """Create a lazy handle.
+
+        Args:
+            context: Context the attachment was pulled in.
+            frame: Frame identifier.
+            index: Index of the attachment in the frame.
+            attach: Attachment metadata as it is returned by the protocol.
+            loader: A function which downloads the attachment.
+            decoder_factory: A function which creates a decoder for the attachment.
+        """
+        self.context = context
+        self.frame = frame
+        self.index = index
+        self.content_type = attach["content_type"]
+        self.application = attach.get("application", None)
+        self.description = attach.get("description", None)
+        self.params = attach.get("params", None)
+        self.settings = attach.get("settings", None)
+        self.length = attach.get("length", None)
+        self._loader = loader
+        self._decoder_factory = decoder_factory
+        self._load_lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+        self._data: ty.Optional[FrameData] = None
+        self._value = None
+        self._decoded = False
+        self._prefetch: ty.Optional[Future] = None
+
+    def media_type(self) -> MediaType:
+        return MediaType(self.content_type, self.application)
+
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    def data(self) -> FrameData:
+        """Download the attachment if it's not downloaded yet.
+
+        Returns:
+            Frame data backed by the pull cache.
+        """
+        prefetch = self._prefetch
+
+        if prefetch is not None:
+            try:
+                return prefetch.result()
+            except Exception:
+                # a failed background download must not be memoized, so try it once more in this thread
+                self._prefetch = None
+
+        return self._load()
+
+    def value(self) -> ty.Any:
+        """Decode the attachment if it's not decoded yet.
+
+        Returns:
+            Decoded object.
+        """
+        with self._decode_lock:
+            if not self._decoded:
+                self._value = self._decode()
+                self._decoded = True
+            return self._value
+
+    def decode(self) -> ty.Any:
+        """Decode the attachment without memoizing the decoded object, e.g. to go through many attachments
+        without keeping all of them in memory. Downloaded data is still memoized.
+
+        Returns:
+            Decoded object, the memoized one if the attachment was decoded by `value`.
+        """
+        with self._decode_lock:
+            if self._decoded:
+                return self._value
+        return self._decode()
+
+    def _decode(self) -> ty.Any:
+        decoder = self._decoder_factory()
+        decoder.set_context(self.context)
+        return decoder.decode(self.data())
+
+    def prefetch(self) -> Future:
+        """Start downloading the attachment in background.
+
+        Returns:
+            A future which is resolved with frame data when the download is finished.
+        """
+        with self._load_lock:
+            if self._prefetch is None:
+                self._prefetch = _get_prefetch_pool().submit(self._load)
+            return self._prefetch
+
+    def _load(self) -> FrameData:
+        with self._load_lock:
+            if self._data is None:
+                self._data = self._loader()
+            return self._data
+
+    def __repr__(self) -> str:
+        return f"LazyFrameData(frame={self.frame}, index={self.index}, media_type={self.content_type}, " \
+               f"application={self.application}, loaded={self.is_loaded()})"
+
+
+def prefetch(*handles: LazyFrameData) -> ty.List[Future]:
+    """Start background downloads for handles which are going to be used soon.
+
+    Args:
+        *handles: Lazy handles returned by `pull(..., lazy=True)`.
+
+    Returns:
+        A list of futures, one per handle.
+    """
+    return [h.prefetch() for h in handles]
+
+
+class Segments(object):
+    """Segments of an append-only stack, see `append`. Segments are downloaded and decoded only when they are
+    iterated over or concatenated.
+    """
+
+    def __init__(self, handles: ty.List[LazyFrameData]):
+        self.handles = handles
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def __iter__(self) -> ty.Iterator[ty.Any]:
+        """Decode segments one by one. Decoded segments are not memoized, so only one segment is in memory
+        at a time unless the caller keeps them."""
+        for h in self.handles:
+            yield h.decode()
+
+    def prefetch(self) -> ty.List[Future]:
+        """Start downloading all segments in background."""
+        return prefetch(*self.handles)
+
+    def value(self) -> ty.Any:
+        """Concatenate all segments.
+
+        Returns:
+            A data frame with rows of all segments in the order they were appended.
+        """
+        import pandas as pd
+
+        if len(self.handles) == 0:
+            return pd.DataFrame()
+
+        self.prefetch()
+        return pd.concat(list(self))
+
+    def __repr__(self) -> str:
+        return f"Segments(segments={len(self.handles)})"
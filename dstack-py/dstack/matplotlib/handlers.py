@@ -1,21 +1,59 @@
 import io
-from typing import Dict, Optional
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, List, Tuple, Sequence
 
+from matplotlib.artist import Artist
+from matplotlib.collections import Collection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 from dstack import BytesContent, Encoder
 from dstack.content import MediaType
 from dstack.stack import FrameData
 
+FORMATS = {"svg": "image/svg+xml", "png": "image/png", "webp": "image/webp"}
+
+# artists with at least this number of points are rasterized inside SVG
+DENSE_POINTS = 10000
+
+# figures with more vector points than this are saved as PNG in the auto mode
+MAX_VECTOR_POINTS = 100000
+
 
 class MatplotlibEncoder(Encoder[Figure]):
     """Handler to deal with matplotlib charts."""
 
+    def __init__(self, format: str = "svg", dpi: Optional[float] = None,
+                 dense_points: Optional[int] = DENSE_POINTS, max_vector_points: int = MAX_VECTOR_POINTS):
+        """Create an encoder.
+
+        Args:
+            format: Image format, i.e. `svg`, `png`, `webp` or `auto`, which saves SVG unless the figure has more
+                than `max_vector_points` points, and PNG otherwise. It's SVG by default, as it always used to be,
+                and other formats must be chosen explicitly.
+            dpi: Resolution of raster images and rasterized artists, the figure resolution by default.
+            dense_points: Artists with at least this number of points are rasterized inside SVG, while axes,
+                labels and other artists stay vector. If it's None, SVG is entirely vector.
+            max_vector_points: Maximum number of points of vector artists which `auto` saves as SVG.
+                It isn't used by other formats.
+        """
+        super().__init__()
+        if format != "auto" and format not in FORMATS:
+            raise ValueError(f"Unsupported format: {format}, supported formats are auto, {', '.join(FORMATS)}")
+        self.format = format
+        self.dpi = dpi
+        self.dense_points = dense_points
+        self.max_vector_points = max_vector_points
+
     def encode(self, obj: Figure, description: Optional[str], params: Optional[Dict]) -> FrameData:
         """Convert matplotlib figure to frame data.
 
         Notes:
-            Figure will be converted to SVG format.
+            The chosen format is the content type of the media type and the `format` setting.
 
         Args:
             obj: Plot to be published.
@@ -25,6 +63,128 @@ class MatplotlibEncoder(Encoder[Figure]):
         Returns:
             Corresponding `FrameData` object.
         """
+        format, dense = self.choose(obj)
+        dpi = self.dpi or obj.dpi
+        # lossy WebP blurs lines and text
+        kwargs = {"pil_kwargs": {"lossless": True}} if format == "webp" else {}
         buf = io.BytesIO()
-        obj.savefig(buf, format="svg")
-        return FrameData(BytesContent(buf), MediaType("image/svg+xml", "matplotlib"), description, params)
+
+        # dense artists are rasterized only while the figure is saved, so the figure stays as it was
+        for artist in dense:
+            artist.set_rasterized(True)
+        try:
+            obj.savefig(buf, format=format, dpi=dpi, **kwargs)
+        finally:
+            for artist in dense:
+                artist.set_rasterized(False)
+
+        settings = {"format": format, "dpi": dpi, "rasterized": len(dense)}
+        return FrameData(BytesContent(buf), MediaType(FORMATS[format], "matplotlib"), description, params, settings)
+
+    def choose(self, obj: Figure) -> Tuple[str, List[Artist]]:
+        """Choose a format of the figure and artists to rasterize.
+
+        Args:
+            obj: A figure.
+
+        Returns:
+            A format and artists which must be rasterized inside SVG.
+        """
+        if self.format not in ("svg", "auto"):
+            return self.format, []
+
+        dense = []
+        vector_points = 0
+        for artist in obj.findobj(lambda a: a.get_visible() and not a.get_rasterized(), include_self=False):
+            n = points(artist)
+            if self.dense_points is not None and n >= self.dense_points and artist.axes is not None:
+                dense.append(artist)
+            else:
+                vector_points += n
+
+        if self.format == "auto" and vector_points > self.max_vector_points:
+            return "png", []
+
+        return "svg", dense
+
+    def options(self) -> Dict:
+        """Get arguments which create the same encoder, e.g. in another process."""
+        return {"format": self.format, "dpi": self.dpi, "dense_points": self.dense_points,
+                "max_vector_points": self.max_vector_points}
+
+
+def render(figures: Sequence[Figure], descriptions: Optional[Sequence[Optional[str]]] = None,
+           params: Optional[Sequence[Optional[Dict]]] = None, encoder: Optional[MatplotlibEncoder] = None,
+           workers: Optional[int] = None) -> List[FrameData]:
+    """Render many figures in parallel processes, because rendering is CPU bound and holds the GIL.
+    Figures are pickled to the processes, so they must be picklable.
+
+    Args:
+        figures: Figures to render.
+        descriptions: Descriptions of the figures.
+        params: Parameters of the figures.
+        encoder: An encoder whose options are used to render every figure, `MatplotlibEncoder()` by default.
+        workers: Number of processes. By default it's the number of CPUs, and 1 renders in this process.
+
+    Returns:
+        Frame data of the figures in the same order, e.g. to add them with `StackFrame.add_data`.
+        The `render_time` setting is the time in seconds which it took to render the figure.
+    """
+    descriptions = descriptions or [None] * len(figures)
+    params = params or [None] * len(figures)
+    if len(descriptions) != len(figures) or len(params) != len(figures):
+        raise ValueError("Descriptions and params must have the same length as figures")
+
+    options = (encoder or MatplotlibEncoder()).options()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        results = [_render(options, figure) for figure in figures]
+    else:
+        results = []
+        with ProcessPoolExecutor(min(workers, max(len(figures), 1))) as executor:
+            # a bounded number of figures is in flight, so pickled figures don't pile up in memory
+            pending = deque()
+            for figure in figures:
+                pending.append(executor.submit(_render_pickled, options, figure))
+                if len(pending) >= 2 * workers:
+                    results.append(pending.popleft().result())
+            while pending:
+                results.append(pending.popleft().result())
+
+    return [FrameData(BytesContent(value), MediaType(content_type, "matplotlib"), d, p, settings)
+            for (value, content_type, settings), d, p in zip(results, descriptions, params)]
+
+
+def _render(options: Dict, figure: Figure) -> Tuple[bytes, str, Dict]:
+    start = time.perf_counter()
+    data = MatplotlibEncoder(**options).encode(figure, None, None)
+    data.settings["render_time"] = time.perf_counter() - start
+    return data.data.value(), data.content_type, data.settings
+
+
+def _render_pickled(options: Dict, figure: Figure) -> Tuple[bytes, str, Dict]:
+    try:
+        return _render(options, figure)
+    finally:
+        # unpickled pyplot figures are registered in pyplot of the process, which would keep them alive
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close(figure)
+
+
+def points(artist: Artist) -> int:
+    """Count points which are drawn by an artist.
+
+    Args:
+        artist: An artist.
+
+    Returns:
+        Number of vertices of lines and collections, e.g. markers of a scatter plot, and 1 for other artists.
+    """
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+
+    if isinstance(artist, Collection):
+        return max(len(artist.get_offsets()), sum(len(path.vertices) for path in artist.get_paths()))
+
+    return 1
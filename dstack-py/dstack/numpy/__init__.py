@@ -0,0 +1,23 @@
+from typing import Any
+
+from dstack.content import MediaType
+from dstack.handler import EncoderFactory, Encoder, DecoderFactory, Decoder
+
+
+class NdArrayEncoderFactory(EncoderFactory):
+    def accept(self, obj: Any) -> bool:
+        # subclasses, e.g. masked arrays and matrices, would lose their own state, memory maps are plain arrays
+        return self.is_type(obj, "numpy.ndarray") or self.is_type(obj, "numpy.memmap")
+
+    def create(self) -> Encoder:
+        from dstack.numpy.handlers import NdArrayEncoder
+        return NdArrayEncoder()
+
+
+class NdArrayDecoderFactory(DecoderFactory):
+    def accept(self, obj: MediaType) -> bool:
+        return obj.application == "numpy/ndarray"
+
+    def create(self, **options) -> Decoder:
+        from dstack.numpy.handlers import NdArrayDecoder
+        return NdArrayDecoder(**options)
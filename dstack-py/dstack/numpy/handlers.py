@@ -0,0 +1,55 @@
+import io
+from typing import Optional, Dict
+
+import numpy as np
+
+from dstack.content import MediaType, FileContent, SpooledContent
+from dstack.handler import Encoder, Decoder
+from dstack.stack import FrameData
+
+
+class NdArrayEncoder(Encoder[np.ndarray]):
+    """An encoder which stores arrays in the `.npy` format, so they are stored losslessly and can be
+    memory mapped when they are decoded."""
+
+    def __init__(self, allow_pickle: bool = False):
+        """Create an encoder.
+
+        Args:
+            allow_pickle: Allow arrays of Python objects, which are pickled.
+        """
+        super().__init__()
+        self.allow_pickle = allow_pickle
+
+    def encode(self, obj: np.ndarray, description: Optional[str], params: Optional[Dict]) -> FrameData:
+        content = SpooledContent()
+        np.save(content.file, np.asanyarray(obj), allow_pickle=self.allow_pickle)
+
+        settings = {"dtype": obj.dtype.str,
+                    "shape": list(obj.shape),
+                    "numpy": np.__version__}
+
+        return FrameData(content, MediaType("application/octet-stream", "numpy/ndarray"),
+                         description, params, settings)
+
+
+class NdArrayDecoder(Decoder[np.ndarray]):
+    def __init__(self, mmap: bool = True, allow_pickle: bool = False):
+        """Create a decoder.
+
+        Args:
+            mmap: Memory map arrays from the pull cache instead of reading them, so arrays of any size are
+                loaded in constant time. Memory mapped arrays are read-only.
+            allow_pickle: Allow arrays of Python objects, which are unpickled.
+        """
+        super().__init__()
+        self.mmap = mmap
+        self.allow_pickle = allow_pickle
+
+    def decode(self, data: FrameData) -> np.ndarray:
+        if isinstance(data.data, FileContent):
+            # arrays of Python objects can't be memory mapped
+            mmap = self.mmap and (data.settings or {}).get("dtype") != np.dtype(object).str
+            return np.load(str(data.data.filename), mmap_mode="r" if mmap else None, allow_pickle=self.allow_pickle)
+
+        return np.load(io.BytesIO(data.data.value()), allow_pickle=self.allow_pickle)
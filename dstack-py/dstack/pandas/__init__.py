@@ -19,9 +19,18 @@ class DataFrameDecoderFactory(DecoderFactory):
     def accept(self, obj: MediaType) -> bool:
         return obj.application == "pandas/dataframe"
 
-    def create(self) -> Decoder:
+    def create(self, **options) -> Decoder:
         from dstack.pandas.handlers import DataFrameDecoder
-        return DataFrameDecoder()
+        return DataFrameDecoder(**options)
+
+
+class RowsEncoderFactory(EncoderFactory):
+    def accept(self, obj: Any) -> bool:
+        return self.is_type(obj, "dstack.pandas.handlers.Rows")
+
+    def create(self) -> Encoder:
+        from dstack.pandas.handlers import RowsEncoder
+        return RowsEncoder()
 
 
 class SeriesEncoderFactory(EncoderFactory):
@@ -37,15 +46,15 @@ class SeriesDecoderFactory(DecoderFactory):
     def accept(self, obj: MediaType) -> bool:
         return obj.application == "pandas/series"
 
-    def create(self) -> Decoder:
+    def create(self, **options) -> Decoder:
         from dstack.pandas.handlers import SeriesDecoder
-        return SeriesDecoder()
+        return SeriesDecoder(**options)
 
 
 class GeneralCsvDecoderFactory(DecoderFactory):
     def accept(self, obj: MediaType) -> bool:
         return obj.content_type == "text/csv"
 
-    def create(self) -> Decoder:
+    def create(self, **options) -> Decoder:
         from dstack.pandas.handlers import GeneralCsvDecoder
-        return GeneralCsvDecoder()
+        return GeneralCsvDecoder(**options)
@@ -1,36 +1,171 @@
+import math
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from csv import QUOTE_ALL
-from io import StringIO
-from typing import Optional, Dict, TypeVar, List
+from datetime import date, datetime
+from io import StringIO, BytesIO
+from typing import Optional, Dict, TypeVar, List, Tuple, Union, Iterator, Any, Iterable, Sequence
 
-from pandas import __version__ as pandas_version, DataFrame, read_csv, Series
+from pandas import __version__ as pandas_version, DataFrame, read_csv, Series, Timestamp
 from pandas.core.generic import NDFrame
 
-from dstack.content import BytesContent, MediaType
+from dstack.content import BytesContent, MediaType, Content, FileContent, SpooledContent
 from dstack.handler import Encoder, Decoder
+from dstack.pandas.summary import summarize, preview
 from dstack.stack import FrameData
 
+CSV = "csv"
+PARQUET = "parquet"
+ARROW = "arrow"
+
+FORMATS = {
+    CSV: "text/csv",
+    PARQUET: "application/vnd.apache.parquet",
+    ARROW: "application/vnd.apache.arrow.file"
+}
+
+# a column name for a series stored in a columnar format, the original name is kept in settings
+SERIES_COLUMN = "__series__"
+
+# longer string statistics are not stored in settings
+MAX_STATISTICS_LENGTH = 256
+
+Filter = Tuple[str, str, Any]
+
+FILTER_OPERATORS = {"==", "=", "!=", "<", "<=", ">", ">=", "in", "not in"}
+
 
 class AbstractDataFrameEncoder(Encoder[NDFrame], ABC):
     def __init__(self, encoding: str = "utf-8", header: bool = True,
-                 index: bool = True):
+                 index: bool = True, format: str = CSV, compression: Optional[str] = None,
+                 row_group_size: Optional[int] = None, statistics: bool = True,
+                 block_size: int = 100000, workers: int = 1,
+                 summary: bool = True, preview_rows: int = 5):
+        """Create an encoder.
+
+        Args:
+            encoding: Text encoding, it's used only by CSV format.
+            header: Write column names, it's used only by CSV format.
+            index: Store the index.
+            format: Storage format, it can be `csv`, `parquet` or `arrow`. CSV is the only format
+                which can be displayed by the web application, columnar formats are much faster and smaller,
+                and keep the schema natively. Columnar formats require `pyarrow`.
+            compression: Compression codec for columnar formats, e.g. `snappy`, `zstd` or `lz4`.
+                By default it's `snappy` for Parquet and no compression for Arrow.
+            row_group_size: Maximum number of rows in a Parquet row group. Smaller row groups let filtered
+                pulls skip more data.
+            statistics: Store min and max values of every column in every Parquet row group in settings,
+                so filtered pulls don't download row groups which can't match.
+            block_size: Number of rows in a block of CSV. Bigger frames are split into blocks which are
+                serialized one by one, or in parallel if `workers` is more than 1, and written to the content
+                in order.
+            workers: Number of processes which serialize CSV blocks, e.g. `os.cpu_count()`. By default blocks
+                are serialized in this process, because starting processes is expensive on some platforms
+                and in notebooks.
+            summary: Store statistics of every column in settings in the order of columns, i.e. the number of
+                values and nulls, min and max values, an estimate of distinct values and a histogram of numeric
+                columns.
+            preview_rows: Number of first rows stored in settings as a preview, `0` disables the preview.
+        """
         super().__init__()
+        if format not in FORMATS:
+            raise ValueError(f"format can be only one of {list(FORMATS.keys())} but found {format}")
         self.encoding = encoding
         self.header = header
         self.index = index
+        self.format = format
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.statistics = statistics
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive but found {block_size}")
+        self.block_size = block_size
+        if workers < 1:
+            raise ValueError(f"workers must be positive but found {workers}")
+        self.workers = workers
+        self.summary = summary
+        self.preview_rows = preview_rows
 
     def encode(self, obj: NDFrame, description: Optional[str], params: Optional[Dict]) -> FrameData:
-        buf = StringIO()
-        obj.to_csv(buf, index=self.index, header=self.header, encoding=self.encoding, quoting=QUOTE_ALL)
         index_type = [str(obj.index.dtype)] if self.index else []
-
-        return FrameData(BytesContent(buf.getvalue().encode(self.encoding)), MediaType("text/csv", self.application()),
-                         description, params,
-                         {"header": self.header,
-                          "index": self.index,
-                          "schema": index_type + self.schema(obj),
-                          "encoding": self.encoding,
-                          "version": pandas_version})
+        settings = {"index": self.index,
+                    "schema": index_type + self.schema(obj),
+                    "version": pandas_version,
+                    "format": self.format}
+
+        if self.summary:
+            settings["summary"] = summarize(obj.to_frame(name=SERIES_COLUMN) if isinstance(obj, Series) else obj)
+        if self.preview_rows > 0:
+            settings["preview"] = preview(obj, self.preview_rows)
+
+        if self.format == CSV:
+            content = self._encode_csv(obj)
+            settings["header"] = self.header
+            settings["encoding"] = self.encoding
+        else:
+            content, extra = self._encode_columnar(obj)
+            settings.update(extra)
+
+        return FrameData(content, MediaType(FORMATS[self.format], self.application()), description, params, settings)
+
+    def _encode_csv(self, obj: NDFrame) -> Content:
+        if len(obj) <= self.block_size:
+            buf = StringIO()
+            obj.to_csv(buf, index=self.index, header=self.header, encoding=self.encoding, quoting=QUOTE_ALL)
+            return BytesContent(buf.getvalue().encode(self.encoding))
+
+        content = SpooledContent()
+        blocks = (obj.iloc[start:start + self.block_size] for start in range(0, len(obj), self.block_size))
+        args = ((block, self.header and i == 0, self.index, self.encoding) for i, block in enumerate(blocks))
+
+        if self.workers == 1:
+            for a in args:
+                content.write(_csv_block(*a))
+            return content
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            # a bounded number of blocks is in flight, so neither blocks nor their text pile up in memory
+            pending = deque()
+            for a in args:
+                pending.append(executor.submit(_csv_block, *a))
+                if len(pending) >= 2 * self.workers:
+                    content.write(pending.popleft().result())
+            while pending:
+                content.write(pending.popleft().result())
+
+        return content
+
+    def _encode_columnar(self, obj: NDFrame) -> Tuple[Content, Dict]:
+        import pyarrow as pa
+
+        extra = {}
+
+        if isinstance(obj, Series):
+            extra["name"] = obj.name
+            obj = obj.to_frame(name=SERIES_COLUMN)
+
+        buf = BytesIO()
+
+        if self.format == PARQUET:
+            import pyarrow.parquet as pq
+            compression = self.compression or "snappy"
+            table = pa.Table.from_pandas(obj, preserve_index=self.index)
+            pq.write_table(table, buf, compression=compression, use_dictionary=True,
+                           row_group_size=self.row_group_size)
+            buf.seek(0)
+            extra["row_groups"] = row_groups(pq.ParquetFile(buf).metadata, self.statistics)
+        else:
+            compression = self.compression
+            table = pa.Table.from_pandas(obj, preserve_index=self.index)
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            with pa.ipc.new_file(buf, table.schema, options=options) as writer:
+                writer.write_table(table)
+
+        extra["compression"] = compression
+        extra["rows"] = table.num_rows
+        buf.seek(0)
+        return BytesContent(buf), extra
 
     @abstractmethod
     def application(self) -> str:
@@ -41,6 +176,51 @@ class AbstractDataFrameEncoder(Encoder[NDFrame], ABC):
         pass
 
 
+def _csv_block(block: NDFrame, header: bool, index: bool, encoding: str) -> bytes:
+    return block.to_csv(index=index, header=header, quoting=QUOTE_ALL).encode(encoding)
+
+
+def row_groups(metadata, statistics: bool) -> List[Dict]:
+    """Describe row groups of a Parquet file for settings.
+
+    Args:
+        metadata: Parquet file metadata.
+        statistics: Include min and max values of columns.
+
+    Returns:
+        A list with the number of rows and, optionally, min and max values by column names for every row group.
+    """
+    result = []
+
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        stats = {}
+
+        for j in range(row_group.num_columns if statistics else 0):
+            column = row_group.column(j)
+            if column.is_stats_set and column.statistics.has_min_max:
+                bounds = [_json_value(column.statistics.min), _json_value(column.statistics.max)]
+                if None not in bounds:
+                    stats[column.path_in_schema] = bounds
+
+        result.append({"rows": row_group.num_rows, "stats": stats})
+
+    return result
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    elif isinstance(value, float):
+        return value if math.isfinite(value) else None
+    elif isinstance(value, str):
+        return value if len(value) <= MAX_STATISTICS_LENGTH else None
+    elif isinstance(value, (bool, int)):
+        return value
+    else:
+        return None
+
+
 class DataFrameEncoder(AbstractDataFrameEncoder):
     def application(self) -> str:
         return "pandas/dataframe"
@@ -57,19 +237,314 @@ class SeriesEncoder(AbstractDataFrameEncoder):
         return [str(obj.dtypes)]
 
 
+class Rows(object):
+    """Rows of a data frame which is not built in memory, e.g. results of a query. Rows are converted
+    and encoded in batches, so memory usage is bounded by the batch size."""
+
+    def __init__(self, rows: Iterable[Union[Dict, Sequence, DataFrame, List]], schema: Dict[str, str],
+                 batch_size: int = 10000):
+        """Create rows.
+
+        Args:
+            rows: An iterable of records or row batches. A record is a dict or a sequence of values in the order
+                of the schema. A batch is a data frame or a list of records.
+            schema: Column types by column names, e.g. `{"id": "int64", "time": "datetime64[ns]"}`.
+            batch_size: Number of records which are converted and encoded at once.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive but found {batch_size}")
+        self.rows = rows
+        self.schema = schema
+        self.batch_size = batch_size
+
+    def batches(self) -> Iterator[DataFrame]:
+        """Convert rows to data frames which conform to the schema.
+
+        Returns:
+            An iterator over data frames, there is at least one, possibly empty, data frame.
+        """
+        records = []
+        empty = True
+
+        for item in self.rows:
+            if isinstance(item, DataFrame) or (isinstance(item, list) and len(item) > 0 and
+                                               isinstance(item[0], (dict, list, tuple))):
+                if len(records) > 0:
+                    yield self._conform(DataFrame.from_records(records, columns=list(self.schema)))
+                    records = []
+                empty = False
+                yield self._conform(item if isinstance(item, DataFrame)
+                                    else DataFrame.from_records(item, columns=list(self.schema)))
+            else:
+                records.append(item)
+                if len(records) >= self.batch_size:
+                    empty = False
+                    yield self._conform(DataFrame.from_records(records, columns=list(self.schema)))
+                    records = []
+
+        if len(records) > 0 or empty:
+            yield self._conform(DataFrame.from_records(records, columns=list(self.schema)))
+
+    def _conform(self, df: DataFrame) -> DataFrame:
+        missing = [c for c in self.schema if c not in df.columns]
+        if len(missing) > 0:
+            raise ValueError(f"Columns {missing} are missing in rows")
+
+        df = df[list(self.schema)].reset_index(drop=True)
+        types = {col: t for col, actual, t in zip(df.columns, df.dtypes, self.schema.values()) if str(actual) != t}
+        return df.astype(types) if types else df
+
+
+class RowsEncoder(AbstractDataFrameEncoder):
+    """An encoder which streams rows into the attachment without building a data frame. The attachment is
+    decoded as a data frame without index."""
+
+    def __init__(self, encoding: str = "utf-8", header: bool = True, format: str = CSV,
+                 compression: Optional[str] = None, row_group_size: Optional[int] = None,
+                 statistics: bool = True, preview_rows: int = 5):
+        """Create an encoder.
+
+        Args:
+            encoding: Text encoding, it's used only by CSV format.
+            header: Write column names, it's used only by CSV format.
+            format: Storage format, it can be `csv`, `parquet` or `arrow`.
+            compression: Compression codec for columnar formats.
+            row_group_size: Maximum number of rows in a Parquet row group.
+            statistics: Store min and max values of every column in every Parquet row group in settings.
+            preview_rows: Number of first rows stored in settings as a preview, `0` disables the preview.
+        """
+        super().__init__(encoding=encoding, header=header, index=False, format=format, compression=compression,
+                         row_group_size=row_group_size, statistics=statistics, summary=False,
+                         preview_rows=preview_rows)
+
+    def encode(self, obj: Rows, description: Optional[str], params: Optional[Dict]) -> FrameData:
+        settings = {"index": False,
+                    "schema": self.schema(obj),
+                    "version": pandas_version,
+                    "format": self.format}
+        content = SpooledContent()
+        batches = obj.batches()
+        first = next(batches)
+
+        if self.preview_rows > 0:
+            settings["preview"] = preview(first, self.preview_rows)
+
+        if self.format == CSV:
+            rows = 0
+            for i, batch in enumerate(_chain(first, batches)):
+                content.write(_csv_block(batch, self.header and i == 0, False, self.encoding))
+                rows += len(batch)
+            settings["header"] = self.header
+            settings["encoding"] = self.encoding
+            settings["rows"] = rows
+        else:
+            settings.update(self._write_columnar(_chain(first, batches), content))
+
+        return FrameData(content, MediaType(FORMATS[self.format], self.application()), description, params, settings)
+
+    def _write_columnar(self, batches: Iterator[DataFrame], content: SpooledContent) -> Dict:
+        import pyarrow as pa
+
+        extra = {}
+        rows = 0
+        writer = None
+        schema = None
+
+        for batch in batches:
+            table = pa.Table.from_pandas(batch, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = self._columnar_writer(content.file, schema)
+            if self.format == PARQUET:
+                writer.write_table(table, row_group_size=self.row_group_size)
+            else:
+                writer.write_table(table)
+            rows += table.num_rows
+
+        writer.close()
+
+        if self.format == PARQUET:
+            import pyarrow.parquet as pq
+            extra["compression"] = self.compression or "snappy"
+            extra["row_groups"] = row_groups(pq.ParquetFile(content.stream()).metadata, self.statistics)
+        else:
+            extra["compression"] = self.compression
+
+        extra["rows"] = rows
+        return extra
+
+    def _columnar_writer(self, sink, schema):
+        import pyarrow as pa
+
+        if self.format == PARQUET:
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(sink, schema, compression=self.compression or "snappy", use_dictionary=True)
+        else:
+            return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression=self.compression))
+
+    def application(self) -> str:
+        return "pandas/dataframe"
+
+    def schema(self, obj: Rows) -> List[str]:
+        return list(obj.schema.values())
+
+
+def _chain(first: DataFrame, rest: Iterator[DataFrame]) -> Iterator[DataFrame]:
+    yield first
+    yield from rest
+
+
 T = TypeVar("T", DataFrame, Series)
 
 
 class AbstractDataFrameDecoder(Decoder[T], ABC):
-    def decode(self, data: FrameData) -> T:
-        index_col = 0 if data.settings.get("index", None) else None
+    def __init__(self, chunksize: Optional[int] = None,
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[List[Filter]] = None):
+        """Create a decoder.
+
+        Args:
+            chunksize: If specified, `decode` returns an iterator over chunks with at most this number of rows
+                instead of a single object, so data bigger than memory can be processed.
+            columns: Decode only these columns. Columnar formats read only the needed columns.
+            filters: Decode only rows which match all conditions. Every condition is a tuple of a column,
+                an operator, which is one of `==`, `!=`, `<`, `<=`, `>`, `>=`, `in` and `not in`, and a value.
+                Parquet row groups which can't match the conditions according to statistics are skipped.
+        """
+        super().__init__()
+        if chunksize is not None and chunksize < 1:
+            raise ValueError(f"chunksize must be positive but found {chunksize}")
+        if (columns is not None or filters is not None) and self.is_series():
+            raise ValueError("columns and filters can be used only with data frames")
+        for f in filters or []:
+            if len(f) != 3 or f[1] not in FILTER_OPERATORS:
+                raise ValueError(f"A filter must be a tuple of a column, one of {sorted(FILTER_OPERATORS)} "
+                                 f"and a value but found {f}")
+        self.chunksize = chunksize
+        self.columns = columns
+        self.filters = filters
+
+    def decode(self, data: FrameData) -> Union[T, Iterator[T]]:
+        storage_format = self.storage_format(data)
+
+        if storage_format == CSV:
+            return self._decode_csv(data)
+        else:
+            return self._decode_columnar(data, storage_format)
+
+    @staticmethod
+    def storage_format(data: FrameData) -> str:
+        settings = data.settings or {}
+
+        if "format" in settings:
+            return settings["format"]
+
+        for storage_format, content_type in FORMATS.items():
+            if content_type == data.content_type:
+                return storage_format
+
+        return CSV
+
+    def _decode_csv(self, data: FrameData) -> Union[T, Iterator[T]]:
+        settings = data.settings or {}
+        index_col = 0 if settings.get("index", None) else None
+        dtype, parse_dates = parser_schema(settings.get("schema", []))
 
         df = read_csv(data.data.stream(),
-                      encoding=data.settings.get("encoding", "utf-8"),
+                      encoding=settings.get("encoding", "utf-8"),
                       index_col=index_col,
-                      squeeze=self.is_series())
+                      dtype=dtype,
+                      parse_dates=parse_dates,
+                      chunksize=self.chunksize)
+
+        if self.chunksize is None:
+            return self._select(self.post_process(self._squeeze(df), settings))
+        else:
+            return self._non_empty(self._select(self.post_process(self._squeeze(chunk), settings)) for chunk in df)
+
+    def _decode_columnar(self, data: FrameData, storage_format: str) -> Union[T, Iterator[T]]:
+        import pyarrow as pa
+
+        read_columns = self._read_columns()
+
+        if storage_format == PARQUET:
+            import pyarrow.parquet as pq
+            # only footer, needed column chunks and row groups are read, so ranged content downloads nothing else
+            source = pq.ParquetFile(data.data.stream())
+            groups = self._row_groups(data.settings or {}, source.num_row_groups)
+
+            if self.chunksize is None:
+                tables = [source.read_row_groups(groups, columns=read_columns, use_pandas_metadata=True)]
+            else:
+                tables = (pa.Table.from_batches([batch]).replace_schema_metadata(source.schema_arrow.metadata)
+                          for batch in source.iter_batches(batch_size=self.chunksize, row_groups=groups,
+                                                           columns=read_columns, use_pandas_metadata=True))
+        elif storage_format == ARROW:
+            # cached attachments are memory mapped, so record batches are read without copying
+            source = pa.memory_map(str(data.data.filename)) if isinstance(data.data, FileContent) \
+                else pa.BufferReader(data.data.value())
+            table = pa.ipc.open_file(source).read_all()
+
+            if read_columns is not None:
+                index_columns = [c for c in (table.schema.pandas_metadata or {}).get("index_columns", [])
+                                 if isinstance(c, str)]
+                table = table.select(read_columns + index_columns)
+
+            if self.chunksize is None:
+                tables = [table]
+            else:
+                tables = (pa.Table.from_batches([batch], table.schema)
+                          for batch in table.to_batches(max_chunksize=self.chunksize))
+        else:
+            raise ValueError(f"Unsupported storage format {storage_format}")
+
+        chunks = (self._select(self._from_columnar(table.to_pandas(), data.settings)) for table in tables)
+
+        return next(chunks) if self.chunksize is None else self._non_empty(chunks)
+
+    def _non_empty(self, chunks: Iterator[T]) -> Iterator[T]:
+        # filtered chunks may lose all rows, they are skipped
+        return (chunk for chunk in chunks if len(chunk) > 0) if self.filters else chunks
+
+    def _read_columns(self) -> Optional[List[str]]:
+        if self.columns is None:
+            return None
+
+        # filtered columns are read as well and dropped after filtering
+        return list(dict.fromkeys(list(self.columns) + [f[0] for f in self.filters or []]))
+
+    def _row_groups(self, settings: Dict, num_row_groups: int) -> List[int]:
+        groups = settings.get("row_groups", None)
+
+        if not self.filters or groups is None or len(groups) != num_row_groups:
+            return list(range(num_row_groups))
+
+        return [i for i, group in enumerate(groups)
+                if all(may_match(group.get("stats", {}).get(column), op, value) for column, op, value in self.filters)]
+
+    def _select(self, df: T) -> T:
+        if self.filters:
+            mask = None
+            for column, op, value in self.filters:
+                m = _compare(_column(df, column), op, value)
+                mask = m if mask is None else mask & m
+            df = df[mask]
+
+        if self.columns is not None:
+            df = df[list(self.columns)]
+
+        return df
+
+    def _from_columnar(self, df: DataFrame, settings: Dict) -> T:
+        if self.is_series():
+            s = df[SERIES_COLUMN]
+            s.name = settings.get("name", None)
+            return s
+
+        return df
 
-        return self.post_process(df, data.settings)
+    def _squeeze(self, df: DataFrame) -> T:
+        return df.iloc[:, 0] if self.is_series() else df
 
     @abstractmethod
     def is_series(self) -> bool:
@@ -80,6 +555,105 @@ class AbstractDataFrameDecoder(Decoder[T], ABC):
         pass
 
 
+def may_match(stats: Optional[List], op: str, value: Any) -> bool:
+    """Check if a row group may contain rows matching the condition.
+
+    Args:
+        stats: Min and max values of the column in the row group, as they are stored in settings.
+        op: Filter operator.
+        value: Filter value.
+
+    Returns:
+        `False` only if no row of the row group can match the condition.
+    """
+    if stats is None:
+        return True
+
+    low, high = stats
+    values = list(value) if op in ("in", "not in") else [value]
+
+    if any(isinstance(v, (datetime, date)) for v in values):
+        low, high = Timestamp(low), Timestamp(high)
+        values = [Timestamp(v) for v in values]
+
+    try:
+        if op in ("==", "="):
+            return low <= values[0] <= high
+        elif op == "!=":
+            return not (low == high == values[0])
+        elif op == "<":
+            return low < values[0]
+        elif op == "<=":
+            return low <= values[0]
+        elif op == ">":
+            return high > values[0]
+        elif op == ">=":
+            return high >= values[0]
+        elif op == "in":
+            return any(low <= v <= high for v in values)
+        else:
+            return not (low == high and low in values)
+    except TypeError:
+        # values which can't be compared with statistics never prune row groups
+        return True
+
+
+def _column(df: DataFrame, column: str) -> Iterable:
+    if column in df.columns:
+        return df[column]
+    elif column in df.index.names:
+        return df.index.get_level_values(column)
+    else:
+        raise ValueError(f"Column {column} not found")
+
+
+def _compare(column, op: str, value: Any):
+    if op in ("==", "="):
+        return column == value
+    elif op == "!=":
+        return column != value
+    elif op == "<":
+        return column < value
+    elif op == "<=":
+        return column <= value
+    elif op == ">":
+        return column > value
+    elif op == ">=":
+        return column >= value
+    elif op == "in":
+        return column.isin(value)
+    else:
+        return ~column.isin(value)
+
+
+def parser_schema(schema: List[str]) -> Tuple[Dict[int, str], List[int]]:
+    """Map the schema stored in settings to `read_csv` arguments, so columns are parsed straight into
+    the right types instead of being converted after parsing.
+
+    Args:
+        schema: Column types including the index type if it's stored.
+
+    Returns:
+        Types of columns by their positions, and positions of datetime columns. Types which the parser
+        can't produce, e.g. categories or time deltas, are omitted and must be converted after parsing.
+    """
+    dtype = {}
+    parse_dates = []
+
+    for position, t in enumerate(schema):
+        if t.startswith("datetime64"):
+            parse_dates.append(position)
+        elif t in PARSER_DTYPES:
+            dtype[position] = t
+
+    return dtype, parse_dates
+
+
+PARSER_DTYPES = {"int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64",
+                 "Int8", "Int16", "Int32", "Int64", "UInt8", "UInt16", "UInt32", "UInt64",
+                 "float32", "float64", "Float32", "Float64", "bool", "boolean", "string"}
+
+
 class DataFrameDecoder(AbstractDataFrameDecoder[DataFrame]):
     def is_series(self) -> bool:
         return False
@@ -89,12 +663,13 @@ class DataFrameDecoder(AbstractDataFrameDecoder[DataFrame]):
         schema = settings["schema"]
 
         if has_index:
-            df.index = df.index.astype(schema[0])
+            if str(df.index.dtype) != schema[0]:
+                df.index = df.index.astype(schema[0])
             schema = schema[1:]
 
-        cols = [str(col) for col in df.columns]
+        types = {col: t for col, actual, t in zip(df.columns, df.dtypes, schema) if str(actual) != t}
 
-        return df.astype(dict(zip(cols, schema)))
+        return df.astype(types, copy=False) if types else df
 
 
 class SeriesDecoder(AbstractDataFrameDecoder[Series]):
@@ -109,7 +684,7 @@ class SeriesDecoder(AbstractDataFrameDecoder[Series]):
             s.index = s.index.astype(schema[0])
             schema = schema[1:]
 
-        return s.astype(schema[0])
+        return s if str(s.dtype) == schema[0] else s.astype(schema[0], copy=False)
 
 
 class GeneralCsvDecoder(AbstractDataFrameDecoder[DataFrame]):
@@ -0,0 +1,116 @@
+import json
+import math
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+from pandas import DataFrame, Series, unique
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_datetime64_any_dtype, is_complex_dtype
+from pandas.util import hash_pandas_object
+
+HISTOGRAM_BINS = 10
+
+# distinct values are counted exactly up to this number of rows and estimated from a hash sample beyond it
+DISTINCT_SAMPLE_SIZE = 65536
+DISTINCT_SKETCH_SIZE = 1024
+
+
+def summarize(df: DataFrame) -> List[Dict[str, Any]]:
+    """Compute statistics of every column, so consumers can describe data without downloading it.
+
+    Args:
+        df: A data frame.
+
+    Returns:
+        Statistics of columns in the order of columns like the schema, because column names may repeat: the column
+        name, the number of values and nulls, min and max values of numeric and datetime columns, an estimate of
+        distinct values and a histogram of numeric columns. Statistics which can't be computed for a column,
+        e.g. distinct values of unhashable objects, are omitted.
+    """
+    return [dict(column=str(column), **column_summary(df.iloc[:, i])) for i, column in enumerate(df.columns)]
+
+
+def column_summary(s: Series) -> Dict[str, Any]:
+    count = int(s.count())
+    stats = {"count": count, "nulls": len(s) - count}
+
+    try:
+        stats["distinct"] = distinct(s)
+    except (TypeError, ValueError):
+        # e.g. lists or dicts in an object column can't be hashed
+        pass
+
+    if count == 0 or is_complex_dtype(s.dtype):
+        return stats
+
+    try:
+        with np.errstate(all="ignore"):
+            stats.update(_range(s))
+    except (ArithmeticError, IndexError, TypeError, ValueError):
+        # the summary is optional, so a column which can't be described doesn't fail the push
+        pass
+
+    return stats
+
+
+def _range(s: Series) -> Dict[str, Any]:
+    stats = {}
+    if is_datetime64_any_dtype(s.dtype):
+        stats["min"] = s.min().isoformat()
+        stats["max"] = s.max().isoformat()
+    elif is_bool_dtype(s.dtype):
+        stats["min"] = bool(s.min())
+        stats["max"] = bool(s.max())
+    elif is_numeric_dtype(s.dtype):
+        values = s.dropna().to_numpy(dtype="float64")
+        values = values[np.isfinite(values)]
+        stats["min"] = _number(s.min())
+        stats["max"] = _number(s.max())
+        if len(values) > 0:
+            low, high = values.min(), values.max()
+            if low == high:
+                # numpy widens an empty range by 0.5, which is lost in the precision of big values
+                counts, edges = np.array([len(values)]), np.array([low, high])
+            else:
+                counts, edges = np.histogram(values, bins=HISTOGRAM_BINS, range=(low, high))
+            stats["histogram"] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return stats
+
+
+def distinct(s: Series) -> int:
+    """Estimate the number of distinct non-null values with the k minimum values sketch. Hashes are sampled
+    by value, so every distinct value is either sampled or skipped in all its occurrences, and the smallest
+    sampled hashes are exactly the smallest hashes of the whole series.
+
+    Args:
+        s: A series.
+
+    Returns:
+        Exact number of distinct values for short or low cardinality series and an estimate for others.
+    """
+    hashes = hash_pandas_object(s.dropna(), index=False).to_numpy()
+
+    if len(hashes) > DISTINCT_SAMPLE_SIZE:
+        threshold = np.uint64(np.iinfo(np.uint64).max // len(hashes) * DISTINCT_SAMPLE_SIZE)
+        smallest = np.unique(hashes[hashes < threshold])
+        if len(smallest) >= DISTINCT_SKETCH_SIZE:
+            return int((DISTINCT_SKETCH_SIZE - 1) * 2.0 ** 64 / float(smallest[DISTINCT_SKETCH_SIZE - 1]))
+
+    return len(unique(hashes))
+
+
+def preview(obj, rows: int) -> Dict[str, Any]:
+    """Take first rows of a data frame or a series.
+
+    Args:
+        obj: A data frame or a series.
+        rows: Number of rows.
+
+    Returns:
+        First rows in the `split` orientation of `to_json`, i.e. columns, index and data.
+    """
+    return json.loads(obj.head(rows).to_json(orient="split", date_format="iso", default_handler=str))
+
+
+def _number(value) -> Optional[float]:
+    value = value.item() if hasattr(value, "item") else value
+    return value if not isinstance(value, float) or math.isfinite(value) else None
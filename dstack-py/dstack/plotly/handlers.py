@@ -1,8 +1,10 @@
-from typing import Dict, Optional
+import base64
+from typing import Dict, Optional, Any
 
 from plotly import __version__ as plotly_version
 from plotly.graph_objs._figure import Figure
 
+from dstack import downsampling
 from dstack.content import BytesContent
 from dstack.content import MediaType
 from dstack.handler import Encoder
@@ -16,15 +18,33 @@ class PlotlyEncoder(Encoder[Figure]):
         Handler stores Plotly version in settings part of the frame data.
     """
 
-    def __init__(self, plotly_js_version: Optional[str] = None):
+    def __init__(self, plotly_js_version: Optional[str] = None, max_points: Optional[int] = None,
+                 method: str = downsampling.LTTB, binary: bool = False):
         """Create an instance with specified Plotly.js version if needed.
 
         Args:
             plotly_js_version: Plotly.js version to use. It will be stored in the settings
             part of frame data.
+            max_points: Downsample scatter traces with more points than this, e.g. a few times the width of
+                the chart in pixels. By default traces are not downsampled.
+            method: Downsampling method, `lttb` or `minmax`, see `dstack.downsampling.downsample`.
+            binary: Store numeric arrays of traces as base64 typed arrays, i.e. `{"dtype": "f8", "bdata": ...}`,
+                which are about 3 times smaller than JSON numbers. Typed arrays are supported by Plotly.js 2.28
+                and later, while the dstack web application renders charts with Plotly.js 1.x, so `binary`
+                requires `plotly_js_version` of at least 2.28, i.e. the version of the application which renders
+                the chart.
+
+        Raises:
+            ValueError: If `binary` is used without `plotly_js_version` which supports typed arrays.
         """
         super().__init__()
+        downsampling.check(max_points, method)
+        if binary:
+            _check_typed_arrays(plotly_js_version)
         self.plotly_js_version = plotly_js_version
+        self.max_points = max_points
+        self.method = method
+        self.binary = binary
 
     def encode(self, obj: Figure, description: Optional[str], params: Optional[Dict]) -> FrameData:
         """Build frame data object from Plotly figure.
@@ -37,8 +57,129 @@ class PlotlyEncoder(Encoder[Figure]):
         Returns:
             Frame data.
         """
-        json = obj.to_json()
-        return FrameData(BytesContent(json.encode("utf-8")),
+        settings = {"plotly_version": plotly_version, "plotly_js_version": self.plotly_js_version}
+
+        if self.max_points is None and not self.binary:
+            json = obj.to_json().encode("utf-8")
+        else:
+            # traces are copied, so the figure isn't changed
+            traces = [trace.to_plotly_json() for trace in obj.data]
+
+            if self.max_points is not None:
+                points, kept = [], []
+                for trace in traces:
+                    if trace.get("type") in ("scatter", "scattergl") and len(trace.get("y", ())) > self.max_points:
+                        indices = downsampling.downsample(trace.get("x"), trace["y"], self.max_points, self.method)
+                        if indices is not None:
+                            points.append(len(trace["y"]))
+                            kept.append(len(indices))
+                            _take(trace, indices, len(trace["y"]))
+                settings["downsampling"] = downsampling.settings(self.method, points, kept)
+
+            if self.binary:
+                settings["typed_arrays"] = sum(_typed_arrays(properties, trace)
+                                               for properties, trace in zip(traces, obj.data))
+
+            figure = {"data": traces, "layout": obj.layout.to_plotly_json()}
+            if obj.frames:
+                figure["frames"] = [frame.to_plotly_json() for frame in obj.frames]
+            json = _dumps(figure)
+
+        return FrameData(BytesContent(json),
                          MediaType("application/json", "plotly"),
-                         description, params,
-                         {"plotly_version": plotly_version, "plotly_js_version": self.plotly_js_version})
+                         description, params, settings)
+
+
+def _take(properties: Dict[str, Any], indices, n: int):
+    # every array of the trace with a value per point, e.g. x, y, text or marker.color, is downsampled
+    import numpy as np
+
+    for key, value in properties.items():
+        if isinstance(value, dict):
+            _take(value, indices, n)
+        elif isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+            value = np.asarray(value)[indices]
+            # arrays of strings and objects stay lists, because only numeric and datetime arrays are serialized
+            # as arrays, e.g. datetime64[ns] would become integers in a list
+            properties[key] = value if value.dtype.kind in "biufmM" else value.tolist()
+
+
+# integer types which Plotly.js typed arrays support, from the smallest
+TYPED_ARRAY_INTEGERS = ["i1", "u1", "i2", "u2", "i4", "u4"]
+
+# the first Plotly.js version which decodes typed arrays
+TYPED_ARRAYS_PLOTLY_JS_VERSION = "2.28.0"
+
+
+def _check_typed_arrays(plotly_js_version: Optional[str]):
+    from packaging.version import Version
+
+    if plotly_js_version is None or Version(plotly_js_version) < Version(TYPED_ARRAYS_PLOTLY_JS_VERSION):
+        raise ValueError(f"binary requires plotly_js_version {TYPED_ARRAYS_PLOTLY_JS_VERSION} or later, "
+                         f"but found {plotly_js_version}")
+
+
+def _typed_arrays(properties: Dict[str, Any], obj: Any) -> int:
+    # numeric arrays and lists of properties which accept arrays, e.g. x, y, z or marker.size, are replaced with
+    # base64 typed arrays, while other lists, e.g. domain.x, must stay lists
+    import numpy as np
+
+    n = 0
+    for key, value in properties.items():
+        validator = _validator(obj, key)
+        if isinstance(value, dict) and validator is not None:
+            n += _typed_arrays(value, obj[key])
+        elif isinstance(value, (list, tuple, np.ndarray)) and len(value) > 0 and \
+                getattr(validator, "array_ok", False):
+            try:
+                a = np.asarray(value)
+            except ValueError:
+                # ragged nested lists
+                continue
+            typed_array = _typed_array(a)
+            if typed_array is not None:
+                properties[key] = typed_array
+                n += 1
+    return n
+
+
+def _validator(obj: Any, key: str) -> Any:
+    # dicts which aren't Plotly objects, e.g. meta, have no validators
+    if hasattr(obj, "_get_validator"):
+        return obj._get_validator(key)
+    if hasattr(obj, "_validators"):
+        return obj._validators.get(key)
+    return None
+
+
+def _typed_array(a) -> Optional[Dict[str, str]]:
+    import numpy as np
+
+    if a.dtype.kind == "f":
+        dtype = np.dtype("f4") if a.dtype.itemsize <= 4 else np.dtype("f8")
+    elif a.dtype.kind in "iu":
+        # there are no 64 bit typed arrays, so integers are stored in the smallest type which fits them
+        low, high = a.min(), a.max()
+        dtype = next((np.dtype(t) for t in TYPED_ARRAY_INTEGERS
+                      if np.iinfo(t).min <= low and high <= np.iinfo(t).max), None)
+        if dtype is None:
+            return None
+    else:
+        return None
+
+    data = np.ascontiguousarray(a, dtype=dtype.newbyteorder("<"))
+    typed_array = {"dtype": dtype.str[1:], "bdata": base64.b64encode(data.data).decode("ascii")}
+    if a.ndim > 1:
+        typed_array["shape"] = ", ".join(str(d) for d in a.shape)
+    return typed_array
+
+
+def _dumps(figure: Dict) -> bytes:
+    # orjson is much faster than the JSON encoder of Plotly, which is used if orjson is not installed
+    # or can't serialize some value
+    try:
+        import orjson
+        return orjson.dumps(figure, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    except (ImportError, TypeError):
+        import plotly.io as pio
+        return pio.to_json(figure, validate=False).encode("utf-8")
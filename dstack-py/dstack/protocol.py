@@ -1,8 +1,7 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, IO, Tuple
+from typing import Dict, Optional, IO, Tuple, List
 
-import requests
 
 import dstack.logger as log
 from dstack.config import Profile
@@ -40,22 +39,64 @@ class Protocol(ABC):
              meta: Optional[Dict]) -> Tuple[str, int, Dict]:
         pass
 
+    @abstractmethod
+    def head(self, stack: str, token: Optional[str]) -> Dict:
+        pass
+
+    @abstractmethod
+    def frames(self, stack: str, token: Optional[str]) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def frame(self, stack: str, token: Optional[str], frame: str) -> Dict:
+        pass
+
+    @abstractmethod
+    def attachment(self, stack: str, token: Optional[str], frame: str, index: int) -> Dict:
+        pass
+
     @abstractmethod
     def download(self, url) -> (IO, int):
         pass
 
+    @abstractmethod
+    def download_range(self, url: str, start: int, end: int) -> bytes:
+        """Download bytes from `start` to `end` inclusive, or the whole content if the storage ignores ranges."""
+        pass
+
 
 def is_sub_dict(super_dict, sub_dict):
     return all(item in super_dict and super_dict.get(item) == sub_dict.get(item) for item in sub_dict if type(item) == str)
 
 
+def find_attach(attachments: List[Dict], params: Optional[Dict]) -> Optional[int]:
+    empty = params is None
+    params = {} if empty else params
+    for index, attach in enumerate(attachments):
+        if (len(attachments) == 1 and empty) or is_sub_dict(attach["params"], params):
+            return index
+    return None
+
+
 class JsonProtocol(Protocol):
     ENCODING = "utf-8"
     MAX_SIZE = 5_000_000
+    POOL_SIZE = 16
 
     def __init__(self, url: str, verify: bool):
         self.url = url
         self.verify = verify
+        # requests is imported only when the protocol is used, so `import dstack` stays cheap
+        import requests
+        import requests.adapters
+
+        # one session per protocol instance, so concurrent pulls reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # last known ETag and response per URL to make polling requests conditional
+        self.etags: Dict[str, Tuple[str, Dict]] = {}
 
     def push(self, stack: str, token: str, data: Dict) -> Dict:
         data["stack"] = stack
@@ -85,26 +126,65 @@ class JsonProtocol(Protocol):
 
     def pull(self, stack: str, token: Optional[str], params: Optional[Dict],
              meta: Optional[Dict]) -> Tuple[str, int, Dict]:
-        empty = params is None
-        params = {} if empty else params
         url = f"/stacks/{stack}"
         res = self.do_request(url, None, token=token, method="GET", stack=stack)
         if meta is None:
+            frame = res["stack"]["head"]["id"]
             attachments = res["stack"]["head"]["attachments"]
         else:
             frames = [f for f in res["stack"]["frames"] if is_sub_dict(f["params"], meta)]
             if len(frames) > 0:
                 frame = frames[len(frames) - 1]["id"]
             else:
-                raise MatchError(params, meta if meta else {})
-            frame_url = f"/frames/{stack}/{frame}"
-            attachments = self.do_request(frame_url, None, token=token, method="GET")["frame"]["attachments"]
-        for index, attach in enumerate(attachments):
-            if (len(attachments) == 1 and empty) or is_sub_dict(attach["params"], params):
-                frame = res["stack"]["head"]["id"]
-                attach_url = f"/attachs/{stack}/{frame}/{index}?download=true"
-                return frame, index, self.do_request(attach_url, None, token=token, method="GET")
-        raise MatchError(params, meta if meta else {})
+                raise MatchError(params or {}, meta if meta else {})
+            attachments = self.frame(stack, token, frame)["attachments"]
+        index = find_attach(attachments, params)
+        if index is None:
+            raise MatchError(params or {}, meta if meta else {})
+        return frame, index, {"attachment": self.attachment(stack, token, frame, index)}
+
+    def frames(self, stack: str, token: Optional[str]) -> List[Dict]:
+        res = self.do_request(f"/stacks/{stack}", None, token=token, method="GET", stack=stack)
+        return res["stack"]["frames"]
+
+    def frame(self, stack: str, token: Optional[str], frame: str) -> Dict:
+        return self.do_request(f"/frames/{stack}/{frame}", None, token=token, method="GET")["frame"]
+
+    def attachment(self, stack: str, token: Optional[str], frame: str, index: int) -> Dict:
+        attach_url = f"/attachs/{stack}/{frame}/{index}?download=true"
+        return self.do_request(attach_url, None, token=token, method="GET")["attachment"]
+
+    def head(self, stack: str, token: Optional[str]) -> Dict:
+        url = self.url + f"/stacks/{stack}/head"
+
+        event_id = log.uuid()
+        log.debug(event_id=event_id, url=url, method="GET")
+
+        headers = {}
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+        cached = self.etags.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = self.session.get(url, headers=headers, verify=self.verify)
+
+        log.debug(event_id=event_id, func=log.ensure_json_serialization, response_headers=response.headers)
+
+        if cached and response.status_code == 304:
+            return cached[1]
+
+        if response.status_code == 404:
+            raise StackNotFoundError(stack)
+
+        response.raise_for_status()
+
+        result = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self.etags[url] = (etag, result)
+
+        return result
 
     def do_request(self, endpoint: str, data: Optional[Dict],
                    token: Optional[str], method: str = "POST", stack: Optional[str] = None) -> Dict:
@@ -117,13 +197,13 @@ class JsonProtocol(Protocol):
         if token is not None:
             headers["Authorization"] = f"Bearer {token}"
         if data is None:
-            response = requests.request(method=method, url=url,
-                                        headers=headers, verify=self.verify)
+            response = self.session.request(method=method, url=url,
+                                            headers=headers, verify=self.verify)
         else:
             data_bytes = json.dumps(data).encode(self.ENCODING)
             headers["Content-Type"] = f"application/json; charset={self.ENCODING}"
-            response = requests.request(method=method, url=url, data=data_bytes,
-                                        headers=headers, verify=self.verify)
+            response = self.session.request(method=method, url=url, data=data_bytes,
+                                            headers=headers, verify=self.verify)
 
         log.debug(event_id=event_id, func=log.erase_token, request_headers=response.request.headers)
         log.debug(event_id=event_id, func=log.ensure_json_serialization, response_headers=response.headers)
@@ -140,17 +220,28 @@ class JsonProtocol(Protocol):
         return response.json()
 
     def download(self, url) -> (IO, int):
-        r = requests.get(url, stream=True, verify=self.verify)
+        r = self.session.get(url, stream=True, verify=self.verify)
 
         log.debug(func=log.ensure_json_serialization, url=url, reponse_headers=r.headers)
 
         return r.raw, int(r.headers['Content-length'])
 
+    def download_range(self, url: str, start: int, end: int) -> bytes:
+        r = self.session.get(url, headers={"Range": f"bytes={start}-{end}"}, verify=self.verify)
+
+        log.debug(func=log.ensure_json_serialization, url=url, reponse_headers=r.headers)
+
+        r.raise_for_status()
+
+        # storage which ignores ranges responds with the whole content, which is returned as it is,
+        # so the caller can cache it instead of downloading it again for every range
+        return r.content
+
     def do_upload(self, upload_url: str, data: Content):
         event_id = log.uuid()
         log.debug(event_id=event_id, url=upload_url, length=data.length())
 
-        response = requests.put(url=upload_url, data=data.stream(), verify=self.verify)
+        response = self.session.put(url=upload_url, data=data.stream(), verify=self.verify)
 
         log.debug(event_id=event_id, func=log.ensure_json_serialization, request_headers=response.request.headers)
         log.debug(event_id=event_id, func=log.ensure_json_serialization, response_headers=response.headers)
@@ -1,3 +1,4 @@
+import io
 from abc import ABC, abstractmethod
 from typing import Optional, Dict
 
@@ -10,19 +11,37 @@ from sklearn.linear_model import LinearRegression
 
 from dstack.content import BytesContent
 from dstack.handler import Encoder, Decoder
-from dstack.sklearn.persistence import CloudPicklePersistence, Persistence, PicklePersistence, JoblibPersistence
+from dstack.sklearn.persistence import CloudPicklePersistence, Persistence, PicklePersistence, JoblibPersistence, \
+    compress, decompress, COMPRESSORS
 from dstack.stack import FrameData
 
 
 class SklearnModelEncoder(Encoder[BaseEstimator]):
     PERSISTENCE = CloudPicklePersistence()
 
-    def __init__(self, persistence: Optional[Persistence] = None):
+    def __init__(self, persistence: Optional[Persistence] = None, compress: Optional[str] = None,
+                 level: Optional[int] = None):
+        """Create an encoder.
+
+        Args:
+            persistence: A persistence which serializes models, `CloudPicklePersistence` by default.
+            compress: Compress serialized models with `gzip`, `bz2` or `lzma`. The codec, the level and sizes
+                before and after compression are stored in the `compression` setting. `JoblibPersistence`
+                compresses models itself.
+            level: Compression level, the default level of the codec if it's None.
+
+        Raises:
+            ValueError: If the codec is not supported.
+        """
         super().__init__()
+        if compress is not None and compress not in COMPRESSORS:
+            raise ValueError(f"Unsupported codec: {compress}, supported codecs are {', '.join(COMPRESSORS)}")
         self.map = {
             LinearRegression: LinearRegressionModelInfo
         }
         self.persistence = persistence if persistence else self.PERSISTENCE
+        self.compress = compress
+        self.level = level
 
     def encode(self, obj: BaseEstimator, description: Optional[str], params: Optional[Dict]) -> FrameData:
         buf = self.persistence.encode(obj)
@@ -33,6 +52,13 @@ class SklearnModelEncoder(Encoder[BaseEstimator]):
                     "numpy": numpy.__version__,
                     "cloudpickle": cloudpickle.__version__,
                     "storage_format": self.persistence.storage()}
+        settings.update(self.persistence.settings())
+
+        if self.compress:
+            data = buf.getvalue() if isinstance(buf, io.BytesIO) else buf
+            buf = compress(data, self.compress, self.level)
+            settings["compression"] = {"codec": self.compress, "level": self.level, "size": len(data),
+                                       "compressed_size": len(buf)}
 
         if obj.__class__ in self.map:
             model_info = self.map[obj.__class__](obj)
@@ -51,7 +77,12 @@ class SklearnModelDecoder(Decoder[BaseEstimator]):
             persist = JoblibPersistence()
         else:
             persist = PicklePersistence()
-        return persist.decode(data.data.stream())
+
+        stream = data.data.stream()
+        compression = data.settings.get("compression")
+        if compression:
+            stream = decompress(stream, compression["codec"])
+        return persist.decode(stream)
 
 
 class AbstractModelInfo(ABC):
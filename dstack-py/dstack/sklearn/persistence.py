@@ -1,6 +1,10 @@
+import bz2
+import gzip
 import io
+import lzma
 import pickle
 from abc import ABC, abstractmethod
+from typing import Optional, Dict, IO
 
 import cloudpickle
 import joblib
@@ -25,11 +29,73 @@ class Persistence(ABC):
     def storage(self) -> str:
         pass
 
+    def settings(self) -> Dict:
+        """Get settings which describe how models are stored, e.g. compression."""
+        return {}
+
+
+# codecs which compress serialized models and decompress them as streams
+COMPRESSORS = {
+    "gzip": (lambda data, level: gzip.compress(data, 9 if level is None else level), gzip.open),
+    "bz2": (lambda data, level: bz2.compress(data, 9 if level is None else level), bz2.open),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.open),
+}
+
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    """Compress data.
+
+    Args:
+        data: Data to compress.
+        codec: `gzip`, `bz2` or `lzma`.
+        level: Compression level, the default level of the codec if it's None.
+
+    Returns:
+        Compressed data.
+
+    Raises:
+        ValueError: If the codec is not supported.
+    """
+    if codec not in COMPRESSORS:
+        raise ValueError(f"Unsupported codec: {codec}, supported codecs are {', '.join(COMPRESSORS)}")
+    return COMPRESSORS[codec][0](data, level)
+
+
+def decompress(stream: IO[bytes], codec: str) -> IO[bytes]:
+    """Decompress a stream.
+
+    Args:
+        stream: A stream of compressed data.
+        codec: A codec which compressed the data.
+
+    Returns:
+        A stream of decompressed data.
+    """
+    return COMPRESSORS[codec][1](stream, "rb")
+
 
 class JoblibPersistence(Persistence):
+    # codecs of joblib, which are detected when models are loaded
+    CODECS = ["zlib", "gzip", "bz2", "lzma", "xz", "lz4"]
+
+    def __init__(self, compress: Optional[str] = None, level: int = 3):
+        """Create a persistence.
+
+        Args:
+            compress: A codec of joblib, `zlib`, `gzip`, `bz2`, `lzma`, `xz` or `lz4`, or None for no compression.
+            level: Compression level.
+
+        Raises:
+            ValueError: If the codec is not supported.
+        """
+        if compress is not None and compress not in self.CODECS:
+            raise ValueError(f"Unsupported codec: {compress}, supported codecs are {', '.join(self.CODECS)}")
+        self.compress = compress
+        self.level = level
+
     def encode(self, model):
         stream = io.BytesIO()
-        joblib.dump(model, stream)
+        joblib.dump(model, stream, compress=(self.compress, self.level) if self.compress else 0)
         return stream
 
     def decode(self, stream):
@@ -41,6 +107,9 @@ class JoblibPersistence(Persistence):
     def storage(self) -> str:
         return "joblib"
 
+    def settings(self) -> Dict:
+        return {"joblib": {"compress": self.compress, "level": self.level}} if self.compress else {}
+
 
 class CloudPicklePersistence(Persistence):
     def encode(self, model):
@@ -60,8 +129,8 @@ class PicklePersistence(Persistence):
     def encode(self, model):
         return pickle.dumps(model)
 
-    def decode(self, data):
-        return pickle.loads(data)
+    def decode(self, stream):
+        return pickle.load(stream)
 
     def type(self) -> MediaType:
         return MediaType("application/octet-stream", "sklearn")
@@ -8,7 +8,7 @@ from uuid import uuid4
 
 from deprecation import deprecated
 
-from dstack import AutoHandler, Context
+from dstack import Context
 from dstack.handler import FrameData, Encoder
 from dstack.version import __version__ as dstack_version
 
@@ -60,6 +60,35 @@ class PushResult(object):
         """ % self.url
 
 
+class FrameInfo(object):
+    """Basic information about a frame in the stack history."""
+
+    def __init__(self, frame_id: str, timestamp: int, params: Optional[Dict] = None):
+        self.id = frame_id
+        self.timestamp = timestamp  # milliseconds
+        self.params = params or {}
+
+    def __repr__(self) -> str:
+        return f"FrameInfo(id={self.id}, timestamp={self.timestamp}, params={self.params})"
+
+
+class PullResult(object):
+    """Outcome of a single item of a bulk pull. Either `value` holds the decoded object or `error` holds
+    the exception raised while resolving, downloading or decoding it."""
+
+    def __init__(self, stack: str, value: Any = None, error: Optional[Exception] = None):
+        self.stack = stack
+        self.value = value
+        self.error = error
+
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"PullResult(stack={self.stack}, error={self.error!r})" if self.error else \
+            f"PullResult(stack={self.stack})"
+
+
 class FrameMeta(object):
     def __init__(self, data: Optional[Dict] = None, **kwargs):
         self.data = merge_or_none(data, kwargs) or {}
@@ -121,10 +150,20 @@ class StackFrame(object):
             **kwargs: Optional parameters is an alternative to params. If both are present this one will
                 be merged into params.
         """
-        encoder = encoder or AutoHandler()
+        if encoder is None:
+            from dstack.auto import AutoHandler
+            encoder = AutoHandler()
         encoder.set_context(self.context)
         params = merge_or_none(params, kwargs)
-        data = encoder.encode(obj, description, params)
+        self.add_data(encoder.encode(obj, description, params))
+
+    def add_data(self, data: FrameData):
+        """Add data which is already encoded to the stack frame, e.g. figures which are rendered in parallel
+        by `dstack.matplotlib.handlers.render`.
+
+        Args:
+            data: Frame data.
+        """
         encrypted_data = self.encryption_method.encrypt(data)
         self.data.append(encrypted_data)
 
@@ -1,7 +1,7 @@
 import shutil
 from abc import ABC
 from pathlib import Path
-from tempfile import gettempdir
+from tempfile import gettempdir, TemporaryDirectory
 from typing import Optional, Dict
 
 import tensorflow as tf
@@ -9,65 +9,85 @@ from tensorflow import keras
 
 import dstack.util as util
 from dstack import FrameData, Encoder, Decoder
-from dstack.content import FileContent, MediaType
+from dstack.config import get_cache_dir
+from dstack.content import MediaType, SpooledContent
 
 
 class TensorFlowKerasModelEncoder(Encoder[keras.Model]):
     STORE_WHOLE_MODEL: bool = True
 
     def __init__(self, store_whole_model: Optional[bool] = None, save_format: str = "tf", archive: str = "zip",
-                 tmp_dir: Optional[str] = None):
+                 tmp_dir: Optional[str] = None, store: bool = False):
+        """Create an encoder.
+
+        Args:
+            store_whole_model: Store the whole model or only its weights.
+            save_format: `tf` for SavedModel or `h5` for HDF5.
+            archive: An archive format of SavedModel directories, `zip`, `tar`, `gztar`, `bztar` or `xztar`.
+            tmp_dir: A directory where models are saved before they are archived.
+            store: Archive files without compression, which is faster for variables that don't compress well.
+        """
         super().__init__()
-        self.store_whole_model = store_whole_model if store_whole_model else self.STORE_WHOLE_MODEL
+        self.store_whole_model = store_whole_model if store_whole_model is not None else self.STORE_WHOLE_MODEL
         self.tmp_dir = Path(tmp_dir if tmp_dir else gettempdir())
         self.save_format = save_format
         self.archive = archive
+        self.store = store
 
     def encode(self, obj: keras.Model, description: Optional[str], params: Optional[Dict]) -> FrameData:
-        filename = util.create_filename(self.tmp_dir)
-
-        if self.store_whole_model:
-            obj.save(filename, save_format=self.save_format)
-            application_type = "tensorflow/model"
-        else:
-            obj.save_wights(filename, save_format=self.save_format)
-            application_type = "tensorflow/weights"
+        content = SpooledContent()
+
+        # the saved model is removed as soon as it's archived, and the archive is streamed to the content,
+        # which is uploaded from memory or from an anonymous temporary file
+        with TemporaryDirectory(dir=self.tmp_dir) as tmp:
+            filename = Path(tmp) / ("model.h5" if self.save_format == "h5" else "model")
+
+            if self.store_whole_model:
+                obj.save(str(filename), save_format=self.save_format)
+                application_type = "tensorflow/model"
+            else:
+                # weights in the tf format are files with a common prefix, so they are put in a directory
+                if self.save_format == "tf":
+                    filename.mkdir()
+                obj.save_weights(str(filename / "weights" if self.save_format == "tf" else filename),
+                                 save_format=self.save_format)
+                application_type = "tensorflow/weights"
+
+            if self.save_format == "tf":
+                util.write_archive(filename, self.archive, content.file, self.store)
+            else:
+                with filename.open("rb") as f:
+                    shutil.copyfileobj(f, content.file)
 
         settings = {
             "class": f"{obj.__class__.__module__}.{obj.__class__.__name__}",
             "tensorflow": tf.__version__,
-            "storage_format": self.archive
+            "storage_format": self.archive if self.save_format == "tf" else self.save_format
         }
 
-        if self.save_format == "tf":
-            archived = util.create_filename(self.tmp_dir)
-            filename = shutil.make_archive(archived, self.archive, filename)
-
-        return FrameData(FileContent(Path(filename)),
+        return FrameData(content,
                          MediaType("application/octet-stream", application_type),
                          description, params, settings)
 
 
 class TensorFlowKerasAbstractDecoder(Decoder[keras.Model], ABC):
     def __init__(self, tmp_dir: Optional[str] = None):
+        """Create a decoder.
+
+        Args:
+            tmp_dir: A directory for models which are not in the pull cache, the pull cache by default.
+        """
         super().__init__()
-        self.tmp_dir = Path(tmp_dir if tmp_dir else gettempdir())
+        self.tmp_dir = Path(tmp_dir) if tmp_dir else get_cache_dir() / "tensorflow"
 
     def save_data(self, data: FrameData) -> str:
-        filename = util.create_filename(self.tmp_dir)
-
-        with data.data.stream() as stream:
-            with open(filename, "wb") as f:
-                f.write(stream.read())
-
         storage_format = data.settings["storage_format"]
 
+        # models are unpacked once and the directory is reused by later pulls of the same frame
         if storage_format != "h5":
-            unpacked = util.create_filename(self.tmp_dir)
-            shutil.unpack_archive(filename, extract_dir=unpacked, format=storage_format)
-            filename = unpacked
+            return str(util.unpack_archive(data.data, storage_format, self.tmp_dir))
 
-        return filename
+        return str(util.cached_file(data.data, self.tmp_dir))
 
 
 class TensorFlowKerasModelDecoder(TensorFlowKerasAbstractDecoder):
@@ -86,4 +106,6 @@ class TensorflowKerasModelWeightsDecoder(TensorFlowKerasAbstractDecoder):
         self.model = model
 
     def decode(self, data: FrameData) -> keras.Model:
-        return self.model.load_weights(self.save_data(data))
+        filename = self.save_data(data)
+        return self.model.load_weights(filename if data.settings["storage_format"] == "h5" else
+                                       str(Path(filename) / "weights"))
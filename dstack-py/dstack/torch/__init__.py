@@ -15,7 +15,7 @@ class TorchModelEncoderFactory(EncoderFactory):
 
 class TorchModelDecoderFactory(DecoderFactory):
     def accept(self, obj: MediaType) -> bool:
-        return self.is_media(obj.application, ["torch/state", "torch/model"])
+        return self.is_media(obj.application, ["torch/state", "torch/model", "torch/tensors"])
 
     def create(self) -> Decoder:
         from dstack.torch.handlers import TorchModelDecoder
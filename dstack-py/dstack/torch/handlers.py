@@ -1,21 +1,52 @@
 import io
-from typing import Optional, Dict
+import mmap
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, Any
 
 import torch
 import torch.version
 from torch.nn import Module
 
 from dstack import FrameData, BytesContent, Encoder, Decoder
-from dstack.content import MediaType
+from dstack.content import MediaType, FileContent, SpooledContent
+from dstack.torch.tensors import write_tensors, read_tensors, check_torch_version
+
+PICKLE = "pickle"
+TENSORS = "tensors"
 
 
 class TorchModelEncoder(Encoder[Module]):
     STORE_WHOLE_MODEL: bool = False
     MAP_LOCATION = None
 
-    def __init__(self, store_whole_model: Optional[bool] = None):
+    def __init__(self, store_whole_model: Optional[bool] = None, format: str = PICKLE,
+                 dtype: Optional[torch.dtype] = None):
+        """Create an encoder.
+
+        Args:
+            store_whole_model: Store the whole model or only its state dict.
+            format: `pickle` saves with `torch.save`, and `tensors` saves state dicts in the tensor file format,
+                which decoders memory map from the pull cache instead of reading, see `dstack.torch.tensors`.
+            dtype: Cast floating tensors of state dicts to a smaller type, e.g. `torch.float16` or
+                `torch.bfloat16`. Original dtypes are stored in the `precision` setting, so decoders restore them.
+
+        Raises:
+            ValueError: If the format or the dtype is not supported, or if the whole model is stored in the
+                `tensors` format or with a dtype.
+        """
         super().__init__()
         self.store_whole_model = store_whole_model if store_whole_model else self.STORE_WHOLE_MODEL
+        if format not in (PICKLE, TENSORS):
+            raise ValueError(f"Unsupported format: {format}, supported formats are {PICKLE}, {TENSORS}")
+        if format == TENSORS and self.store_whole_model:
+            raise ValueError("Only state dicts can be stored in the tensors format")
+        if format == TENSORS:
+            # the format can be written by older versions, but it couldn't be pulled
+            check_torch_version()
+        if dtype is not None and (not dtype.is_floating_point or self.store_whole_model):
+            raise ValueError(f"Only state dicts can be cast, and only to a floating dtype, got {dtype}")
+        self.format = format
+        self.dtype = dtype
 
     def encode(self, obj: Module, description: Optional[str], params: Optional[Dict]) -> FrameData:
         buf = io.BytesIO()
@@ -24,11 +55,21 @@ class TorchModelEncoder(Encoder[Module]):
         settings = {"class": f"{obj.__class__.__module__}.{obj.__class__.__name__}",
                     "torch": torch.version.__version__}
 
+        state = None if self.store_whole_model else obj.state_dict()
+        if self.dtype is not None:
+            state, settings["precision"] = reduce_precision(state, self.dtype)
+
+        if self.format == TENSORS:
+            content = SpooledContent()
+            settings["tensors"] = len(write_tensors(state, content.file))
+            return FrameData(content, MediaType("application/octet-stream", "torch/tensors"),
+                             description, params, settings)
+
         if self.store_whole_model:
             torch.save(obj, buf)
             application_type = "torch/model"
         else:
-            torch.save(obj.state_dict(), buf)
+            torch.save(state, buf)
             application_type = "torch/state"
 
         return FrameData(BytesContent(buf),
@@ -37,12 +78,23 @@ class TorchModelEncoder(Encoder[Module]):
 
 
 class TorchModelDecoder(Decoder[Module]):
-    def __init__(self, map_location: Optional[torch.device] = None):
+    def __init__(self, map_location: Optional[torch.device] = None, restore_dtypes: bool = True):
+        """Create a decoder.
+
+        Args:
+            map_location: A device to move tensors to.
+            restore_dtypes: Cast tensors of state dicts which were stored with reduced precision back to their
+                original dtypes. Casting copies tensors, so cast tensors in the tensor file format are not memory
+                mapped anymore, while they stay memory mapped if dtypes are not restored.
+        """
         super().__init__()
         self.map_location = map_location if map_location else TorchModelEncoder.MAP_LOCATION
+        self.restore_dtypes = restore_dtypes
 
     def decode(self, data: FrameData) -> Module:
-        return torch.load(data.data.stream(), self.map_location)
+        if data.application == "torch/model":
+            return torch.load(data.data.stream(), self.map_location)
+        return load_state(data, self.map_location, self.restore_dtypes)
 
 
 class TorchModelWeightsDecoder(Decoder[Module]):
@@ -53,6 +105,84 @@ class TorchModelWeightsDecoder(Decoder[Module]):
         self.model = model
 
     def decode(self, data: FrameData) -> Module:
-        self.model.load_state_dict(torch.load(data.data.stream(), self.map_location))
+        self.model.load_state_dict(load_state(data, self.map_location))
         self.model.eval()
         return self.model
+
+
+def reduce_precision(state: Dict[str, torch.Tensor],
+                     dtype: torch.dtype) -> Tuple[Dict[str, torch.Tensor], Dict[str, Any]]:
+    """Cast floating tensors of a state dict to a smaller floating dtype.
+
+    Args:
+        state: A state dict.
+        dtype: A floating dtype.
+
+    Returns:
+        A state dict with cast tensors, and the `precision` setting with the dtype, original dtypes of cast
+        tensors by names, and sizes of tensors in bytes before and after the cast.
+    """
+    reduced = OrderedDict()
+    dtypes = {}
+    size = reduced_size = 0
+    for name, tensor in state.items():
+        if isinstance(tensor, torch.Tensor):
+            size += tensor.numel() * tensor.element_size()
+            if tensor.is_floating_point() and tensor.dtype != dtype:
+                dtypes[name] = str(tensor.dtype)[len("torch."):]
+                tensor = tensor.to(dtype)
+            reduced_size += tensor.numel() * tensor.element_size()
+        reduced[name] = tensor
+
+    return reduced, {"dtype": str(dtype)[len("torch."):], "dtypes": dtypes, "size": size,
+                     "reduced_size": reduced_size}
+
+
+def load_state(data: FrameData, map_location: Optional[torch.device] = None,
+               restore_dtypes: bool = True) -> Dict[str, torch.Tensor]:
+    """Load a state dict in any format and restore dtypes of tensors which were stored with reduced precision.
+
+    Args:
+        data: Frame data of a state dict.
+        map_location: A device to move tensors to.
+        restore_dtypes: Restore original dtypes. It copies cast tensors, see `load_tensors`.
+
+    Returns:
+        The state dict.
+    """
+    if data.application == "torch/tensors":
+        state = load_tensors(data, map_location)
+    else:
+        state = torch.load(data.data.stream(), map_location)
+
+    precision = (data.settings or {}).get("precision")
+    if restore_dtypes and precision:
+        for name, dtype in precision["dtypes"].items():
+            state[name] = state[name].to(getattr(torch, dtype))
+    return state
+
+
+def load_tensors(data: FrameData, map_location: Optional[torch.device] = None) -> Dict[str, torch.Tensor]:
+    """Load a state dict in the tensor file format. A file of the pull cache is memory mapped, so tensors are
+    built on the mapped file without copying and pages are read only when tensors are used. Moving tensors to
+    another device or casting them to another dtype copies them. It requires torch 1.10 or later.
+
+    Args:
+        data: Frame data in the tensor file format.
+        map_location: A device to move tensors to.
+
+    Returns:
+        The state dict.
+    """
+    if isinstance(data.data, FileContent):
+        with data.data.filename.open("rb") as f:
+            # a private mapping is writable, so tensors can be changed without changing the cached file
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    else:
+        buffer = bytearray(data.data.value())
+
+    tensors = read_tensors(buffer)
+    if map_location is not None:
+        for name, tensor in tensors.items():
+            tensors[name] = tensor.to(map_location)
+    return tensors
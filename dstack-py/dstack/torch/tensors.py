@@ -0,0 +1,106 @@
+import json
+import struct
+from collections import OrderedDict
+from typing import Dict, IO, Any
+
+import torch
+
+# buffers are aligned, so every tensor can be built on a memory mapped file without copying
+ALIGNMENT = 64
+MAGIC = b"DSTT"
+VERSION = 1
+
+# magic, version and length of the JSON header
+PREFIX = struct.Struct("<4sIQ")
+
+# tensors are built on buffers with torch.frombuffer, which appeared in torch 1.10
+MIN_TORCH_VERSION = "1.10"
+
+
+def check_torch_version():
+    """Check that the installed torch supports the tensor file format.
+
+    Raises:
+        ValueError: If torch is older than `MIN_TORCH_VERSION`.
+    """
+    if not hasattr(torch, "frombuffer"):
+        raise ValueError(f"The tensor file format requires torch {MIN_TORCH_VERSION} or later, "
+                         f"but found {torch.__version__}")
+
+
+def write_tensors(tensors: Dict[str, torch.Tensor], file: IO[bytes]) -> Dict[str, Any]:
+    """Write tensors to a file in the tensor file format: a prefix, a JSON header with names, dtypes, shapes and
+    offsets of tensors, and raw buffers of tensors, each aligned to `ALIGNMENT` bytes.
+
+    Args:
+        tensors: Tensors by names, e.g. a state dict.
+        file: A file object to write to.
+
+    Returns:
+        The header.
+
+    Raises:
+        ValueError: If a value is not a tensor.
+    """
+    header = {}
+    offset = 0
+    for name, tensor in tensors.items():
+        if not isinstance(tensor, torch.Tensor):
+            raise ValueError(f"{name} is not a tensor: {type(tensor)}")
+        length = tensor.numel() * tensor.element_size()
+        header[name] = {"dtype": str(tensor.dtype)[len("torch."):], "shape": list(tensor.shape),
+                        "offset": offset, "length": length}
+        offset = _align(offset + length)
+
+    data = json.dumps(header).encode("utf-8")
+    start = _align(PREFIX.size + len(data))
+    file.write(PREFIX.pack(MAGIC, VERSION, len(data)))
+    file.write(data)
+    file.write(b"\0" * (start - PREFIX.size - len(data)))
+
+    position = 0
+    for name, tensor in tensors.items():
+        entry = header[name]
+        file.write(b"\0" * (entry["offset"] - position))
+        if entry["length"] > 0:
+            raw = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+            file.write(memoryview(raw.numpy()))
+        position = entry["offset"] + entry["length"]
+
+    return header
+
+
+def read_tensors(buffer) -> Dict[str, torch.Tensor]:
+    """Build tensors on a buffer in the tensor file format without copying, so tensors share memory with the
+    buffer, e.g. a memory mapped file.
+
+    Args:
+        buffer: A writable object which supports the buffer protocol, e.g. `mmap.mmap` or `bytearray`.
+
+    Returns:
+        Tensors by names in the order they were written.
+
+    Raises:
+        ValueError: If the buffer is not in the tensor file format, or if torch doesn't support it.
+    """
+    check_torch_version()
+    magic, version, length = PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a tensor file or an unsupported version")
+    header = json.loads(bytes(memoryview(buffer)[PREFIX.size:PREFIX.size + length]).decode("utf-8"))
+    start = _align(PREFIX.size + length)
+
+    tensors = OrderedDict()
+    for name, entry in header.items():
+        dtype = getattr(torch, entry["dtype"])
+        if entry["length"] == 0:
+            tensors[name] = torch.empty(entry["shape"], dtype=dtype)
+        else:
+            count = entry["length"] // torch.empty((), dtype=dtype).element_size()
+            tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=start + entry["offset"])
+            tensors[name] = tensor.view(entry["shape"])
+    return tensors
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -1,20 +1,24 @@
-from tqdm import tqdm as std_tqdm
-from tqdm.utils import _range
-from abc import ABC, abstractmethod
+import sys
+import threading
 import typing as ty
+from abc import ABC, abstractmethod
+
+if ty.TYPE_CHECKING:
+    from tqdm import tqdm as std_tqdm
 
 
 class TqdmHandler(ABC):
     @abstractmethod
-    def display(self, tqdm: std_tqdm):
+    def display(self, tqdm: "std_tqdm"):
         pass
 
     @abstractmethod
-    def close(self, tqdm: std_tqdm):
+    def close(self, tqdm: "std_tqdm"):
         pass
 
 
 _tqdm_handler: ty.Optional[TqdmHandler] = None
+_lock = threading.Lock()
 
 
 def set_tqdm_handler(handler: ty.Optional[TqdmHandler]):
@@ -22,18 +26,39 @@ def set_tqdm_handler(handler: ty.Optional[TqdmHandler]):
     _tqdm_handler = handler
 
 
-class tqdm(std_tqdm):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+def _define_tqdm() -> type:
+    # tqdm is expensive to import, so the subclass is defined on the first access to `tqdm`
+    from tqdm import tqdm as std_tqdm
+
+    class tqdm(std_tqdm):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
 
-    def close(self):
-        if _tqdm_handler:
-            _tqdm_handler.close(self)
+        def close(self):
+            if _tqdm_handler:
+                _tqdm_handler.close(self)
 
-    def display(self, msg=None, pos=None):
-        if _tqdm_handler:
-            _tqdm_handler.display(self)
+        def display(self, msg=None, pos=None):
+            if _tqdm_handler:
+                _tqdm_handler.display(self)
+
+    tqdm.__qualname__ = "tqdm"
+    return tqdm
 
 
 def trange(*args, **kwargs):
-    return tqdm(_range(*args), **kwargs)
+    return sys.modules[__name__].tqdm(range(*args), **kwargs)
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name: str):
+        if name == "tqdm":
+            with _lock:
+                if "tqdm" not in globals():
+                    globals()["tqdm"] = _define_tqdm()
+            return globals()["tqdm"]
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+else:
+    # module __getattr__ requires Python 3.7, so older versions define the subclass eagerly
+    tqdm = _define_tqdm()
+
@@ -1,7 +1,15 @@
+import hashlib
+import shutil
+import tempfile
 import typing as ty
 from pathlib import Path
 from uuid import uuid4
 
+from dstack.content import Content, FileContent
+
+# compressions of tar archives by `shutil` archive formats
+TAR_COMPRESSIONS = {"tar": "", "gztar": "gz", "bztar": "bz2", "xztar": "xz"}
+
 
 def create_filename(tmp_dir: ty.Union[str, Path]) -> str:
     return str(create_path(tmp_dir))
@@ -15,3 +23,102 @@ def is_jupyter() -> bool:
     return hasattr(globals(), "_dh")
 
 
+def write_archive(directory: Path, format: str, file: ty.IO[bytes], store: bool = False):
+    """Write files of a directory to an archive which is streamed to a file object, e.g. of `SpooledContent`,
+    so the archive isn't a file in a temporary directory. Archives can be unpacked with `shutil.unpack_archive`.
+
+    Args:
+        directory: A directory.
+        format: An archive format of `shutil`, i.e. `zip`, `tar`, `gztar`, `bztar` or `xztar`.
+        file: A file object to write to.
+        store: Store files without compression, which is faster for data that doesn't compress well.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    # archive modules are imported only when they are used, so `import dstack` stays cheap
+    import tarfile
+    import zipfile
+
+    if format == "zip":
+        with zipfile.ZipFile(file, "w", zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED) as z:
+            for path in sorted(directory.rglob("*")):
+                z.write(path, path.relative_to(directory).as_posix())
+    elif format in TAR_COMPRESSIONS:
+        compression = "" if store else TAR_COMPRESSIONS[format]
+        with tarfile.open(fileobj=file, mode=f"w|{compression}") as t:
+            t.add(str(directory), arcname=".")
+    else:
+        raise ValueError(f"Unsupported archive format: {format}")
+
+
+def unpacked_path(filename: Path) -> Path:
+    """Get the directory where an archive is unpacked. It's next to the archive, so when an archive in the pull
+    cache is replaced, the directory is removed with it.
+
+    Args:
+        filename: A path to an archive.
+
+    Returns:
+        A path to the directory.
+    """
+    return filename.with_name(filename.name + ".unpacked")
+
+
+def cached_file(data: Content, cache_dir: Path) -> Path:
+    """Get a file with the content. A file of the pull cache is used as it is, and other content is streamed
+    to a file in the cache directory named after its digest, so the same content is stored once.
+
+    Args:
+        data: Content.
+        cache_dir: A directory for content which is not a file.
+
+    Returns:
+        A path to the file.
+    """
+    if isinstance(data, FileContent):
+        return data.filename
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as f:
+        with data.stream() as stream:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                digest.update(chunk)
+                f.write(chunk)
+
+    filename = cache_dir / digest.hexdigest()
+    Path(f.name).replace(filename)
+    return filename
+
+
+def unpack_archive(data: Content, format: str, cache_dir: Path) -> Path:
+    """Unpack an archive once, so later calls with the same content reuse the directory.
+
+    Args:
+        data: Content of an archive.
+        format: An archive format of `shutil`.
+        cache_dir: A directory for content which is not a file, see `cached_file`.
+
+    Returns:
+        A path to the unpacked directory.
+    """
+    filename = cached_file(data, cache_dir)
+    directory = unpacked_path(filename)
+    if directory.exists():
+        return directory
+
+    # archives are unpacked to a temporary directory and renamed, so a directory is either complete or missing
+    tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=directory.name + "."))
+    try:
+        shutil.unpack_archive(str(filename), extract_dir=str(tmp), format=format)
+        try:
+            tmp.rename(directory)
+        except OSError:
+            # the same archive is unpacked concurrently
+            if not directory.exists():
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return directory
@@ -13,9 +13,9 @@ setup(
     version=get_version(),
     author="swordhands",
     author_email="team@dstack.ai",
-    packages=["dstack", "dstack.application", "dstack.cli", "dstack.files", "dstack.bokeh", "dstack.matplotlib",
-              "dstack.md", "dstack.pandas", "dstack.geopandas", "dstack.plotly", "dstack.sklearn",
-              "dstack.tensorflow", "dstack.torch"],
+    packages=["dstack", "dstack.application", "dstack.arrow", "dstack.cli", "dstack.files", "dstack.bokeh",
+              "dstack.matplotlib", "dstack.md", "dstack.numpy", "dstack.pandas", "dstack.geopandas", "dstack.plotly",
+              "dstack.sklearn", "dstack.tensorflow", "dstack.torch"],
     scripts=[],
     entry_points={
         "console_scripts": ["dstack=dstack.cli.main:main"],
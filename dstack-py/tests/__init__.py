@@ -1,8 +1,10 @@
 import copy
 import unittest
-from typing import Dict, Optional, Tuple
+from io import BytesIO
+from typing import Dict, Optional, Tuple, List, IO
 
 from dstack.config import Profile, InPlaceConfig, configure
+from dstack.content import Content
 from dstack.protocol import Protocol, ProtocolFactory, setup_protocol, StackNotFoundError
 
 
@@ -10,7 +12,12 @@ class TestProtocol(Protocol):
     def __init__(self):
         self.exception = None
         self.data = {}
+        self.history = {}
         self.token = None
+        # attachments bigger than the limit are served by download urls instead of inline data
+        self.inline_limit = None
+        self.downloaded = 0
+        self.blobs = {}
 
     def push(self, stack: str, token: str, data: Dict) -> Dict:
         data["stack"] = stack
@@ -29,12 +36,53 @@ class TestProtocol(Protocol):
                     set(attach["params"].items()) == set(params.items()):
                 d = attach.pop("data")
                 attach1 = copy.deepcopy(attach)
-                attach1["data"] = d.base64value()
                 attach["data"] = d
-                return frame, index, {"attachment": attach1}
+                return frame, index, {"attachment": self.with_data(stack, frame, index, attach1, d)}
 
-    def download(self, url):
-        raise NotImplementedError()
+    def head(self, stack: str, token: Optional[str]) -> Dict:
+        data = self.get_data(stack)
+        return {"head": {"id": data["id"], "timestamp": data["timestamp"]}}
+
+    def frames(self, stack: str, token: Optional[str]) -> List[Dict]:
+        self.get_data(stack)
+        return [{"id": f["id"], "timestamp": f["timestamp"], "params": f.get("params", {})}
+                for f in self.history[stack]]
+
+    def frame(self, stack: str, token: Optional[str], frame: str) -> Dict:
+        f = self.get_frame(stack, frame)
+        attachments = [{k: v for k, v in a.items() if k != "data"} for a in f["attachments"]]
+        return {"id": f["id"], "timestamp": f["timestamp"], "params": f.get("params", {}), "attachments": attachments}
+
+    def attachment(self, stack: str, token: Optional[str], frame: str, index: int) -> Dict:
+        attach = copy.copy(self.get_frame(stack, frame)["attachments"][index])
+        return self.with_data(stack, frame, index, attach, attach.pop("data"))
+
+    def with_data(self, stack: str, frame: str, index: int, attach: Dict, data: Content) -> Dict:
+        if self.inline_limit is not None and data.length() > self.inline_limit:
+            url = f"test://{stack}/{frame}/{index}"
+            self.blobs[url] = data.value()
+            attach["download_url"] = url
+            attach["length"] = data.length()
+        else:
+            attach["data"] = data.base64value()
+        return attach
+
+    def get_frame(self, stack: str, frame: str) -> Dict:
+        self.get_data(stack)
+        for f in self.history[stack]:
+            if f["id"] == frame:
+                return f
+        raise ValueError(f"Frame {frame} not found")
+
+    def download(self, url) -> Tuple[IO, int]:
+        blob = self.blobs[url]
+        self.downloaded += len(blob)
+        return BytesIO(blob), len(blob)
+
+    def download_range(self, url: str, start: int, end: int) -> bytes:
+        blob = self.blobs[url][start:end + 1]
+        self.downloaded += len(blob)
+        return blob
 
     def get_data(self, stack: str) -> Dict:
         if stack not in self.data:
@@ -44,6 +92,8 @@ class TestProtocol(Protocol):
 
     def handler(self, data: Dict, token: str) -> Dict:
         self.data[data["stack"]] = data
+        if "attachments" in data:
+            self.history.setdefault(data["stack"], []).append(data)
         self.token = token
         stack = data["stack"]
         return {"url": f"https://api.dstack.ai/{stack}"}
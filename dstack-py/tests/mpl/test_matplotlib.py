@@ -0,0 +1,89 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from dstack import push, frame, pull_frame
+from dstack.matplotlib.handlers import MatplotlibEncoder, render
+from tests import TestBase
+
+
+class TestMatplotlib(TestBase):
+    def tearDown(self):
+        plt.close("all")
+        super().tearDown()
+
+    def test_small_figure_is_vector(self):
+        fig = plt.figure()
+        plt.plot([1, 2, 3], [2, 1, 3])
+        push("test/matplotlib/small", fig)
+        attach = self.get_data("test/matplotlib/small")["attachments"][0]
+        self.assertEqual("image/svg+xml", attach["content_type"])
+        self.assertEqual("svg", attach["settings"]["format"])
+        self.assertEqual(0, attach["settings"]["rasterized"])
+        self.assertIn(b"<svg", attach["data"].value())
+
+    def test_dense_artists_are_rasterized(self):
+        fig = plt.figure()
+        scatter = plt.scatter(np.random.rand(20000), np.random.rand(20000))
+        plt.title("scatter")
+        push("test/matplotlib/dense", fig)
+        attach = self.get_data("test/matplotlib/dense")["attachments"][0]
+        self.assertEqual("image/svg+xml", attach["content_type"])
+        self.assertEqual(1, attach["settings"]["rasterized"])
+        svg = attach["data"].value()
+        self.assertIn(b"<image", svg)
+        self.assertLess(len(svg), 1000000)
+        self.assertFalse(scatter.get_rasterized())
+
+    def test_many_vector_points_are_raster(self):
+        fig = plt.figure()
+        for i in range(20):
+            plt.plot(np.random.rand(9000))
+        # SVG is the default, so figures which were pushed before keep their format
+        self.assertEqual("svg", MatplotlibEncoder().encode(fig, None, None).settings["format"])
+
+        encoder = MatplotlibEncoder(format="auto", dpi=50)
+        data = encoder.encode(fig, None, None)
+        self.assertEqual("image/png", data.media_type().content_type)
+        self.assertEqual({"format": "png", "dpi": 50, "rasterized": 0}, data.settings)
+        self.assertEqual(b"\x89PNG", data.data.value()[:4])
+
+        data = MatplotlibEncoder(format="svg", dense_points=None).encode(fig, None, None)
+        self.assertEqual("image/svg+xml", data.media_type().content_type)
+        self.assertNotIn(b"<image", data.data.value())
+
+    def test_formats(self):
+        fig = plt.figure()
+        plt.plot([1, 2, 3])
+        data = MatplotlibEncoder(format="webp").encode(fig, None, None)
+        self.assertEqual("image/webp", data.media_type().content_type)
+        self.assertEqual(b"WEBP", data.data.value()[8:12])
+        self.assertRaises(ValueError, MatplotlibEncoder, format="gif")
+
+    def test_render(self):
+        figures = []
+        for i in range(5):
+            fig = plt.figure()
+            plt.plot(np.arange(10) * i)
+            figures.append(fig)
+
+        params = [{"i": i} for i in range(5)]
+        rendered = render(figures, params=params, encoder=MatplotlibEncoder(format="png"), workers=2)
+        serial = render(figures, params=params, encoder=MatplotlibEncoder(format="png"), workers=1)
+        self.assertEqual([d.data.value() for d in serial], [d.data.value() for d in rendered])
+        for i, data in enumerate(rendered):
+            self.assertEqual({"i": i}, data.params)
+            self.assertEqual("image/png", data.content_type)
+            self.assertGreater(data.settings["render_time"], 0)
+
+        f = frame("test/matplotlib/render")
+        for data in rendered:
+            f.add_data(data)
+        f.push()
+        attachments = pull_frame("test/matplotlib/render")
+        self.assertEqual([{"i": i} for i in range(5)], [a.params for a in attachments])
+
+        self.assertRaises(ValueError, render, figures, descriptions=["a"])
@@ -0,0 +1,48 @@
+import numpy as np
+
+from dstack import push, pull
+from dstack.auto import UnsupportedObjectTypeException
+from dstack.numpy.handlers import NdArrayEncoder, NdArrayDecoder
+from tests import TestBase
+
+
+class TestNumpy(TestBase):
+    def test_ndarray(self):
+        a = np.random.rand(100, 16).astype(np.float32)
+        push("test/numpy/ndarray", a)
+        settings = self.get_data("test/numpy/ndarray")["attachments"][0]["settings"]
+        self.assertEqual([100, 16], settings["shape"])
+        self.assertEqual("<f4", settings["dtype"])
+
+        a1 = pull("test/numpy/ndarray")
+        self.assertIsInstance(a1, np.memmap)
+        self.assertFalse(a1.flags.writeable)
+        self.assertTrue(np.array_equal(a, a1))
+
+        a2 = pull("test/numpy/ndarray", decoder=NdArrayDecoder(mmap=False))
+        self.assertNotIsInstance(a2, np.memmap)
+        self.assertTrue(np.array_equal(a, a2))
+
+    def test_structured_and_scalar(self):
+        a = np.array([(1, 2.5), (2, 3.5)], dtype=[("id", "i8"), ("value", "f8")])
+        push("test/numpy/structured", a)
+        self.assertTrue(np.array_equal(a, pull("test/numpy/structured")))
+
+        push("test/numpy/scalar", np.array(42))
+        self.assertEqual(42, pull("test/numpy/scalar"))
+
+    def test_objects(self):
+        a = np.array([{"a": 1}, None], dtype=object)
+        self.assertRaises(ValueError, push, "test/numpy/objects", a)
+        push("test/numpy/objects", a, encoder=NdArrayEncoder(allow_pickle=True))
+        self.assertEqual({"a": 1}, pull("test/numpy/objects", decoder=NdArrayDecoder(allow_pickle=True))[0])
+
+    def test_subclasses(self):
+        a = np.arange(6, dtype=np.float64)
+        push("test/numpy/memmap", a)
+        push("test/numpy/memmap", pull("test/numpy/memmap"))
+        self.assertTrue(np.array_equal(a, pull("test/numpy/memmap")))
+
+        # the mask or the matrix type would be silently lost
+        self.assertRaises(UnsupportedObjectTypeException, push, "test/numpy/masked", np.ma.masked_array(a, a > 3))
+        self.assertRaises(UnsupportedObjectTypeException, push, "test/numpy/matrix", np.matrix([[1, 2]]))
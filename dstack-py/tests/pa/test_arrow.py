@@ -0,0 +1,30 @@
+import pyarrow as pa
+
+from dstack import push, pull
+from dstack.arrow.handlers import ArrowEncoder, ArrowDecoder
+from tests import TestBase
+
+
+class TestArrow(TestBase):
+    def test_table(self):
+        table = pa.table({"id": pa.array(range(100), pa.int64()),
+                          "name": pa.array([f"n{i}" for i in range(100)])})
+        push("test/arrow/table", table)
+        settings = self.get_data("test/arrow/table")["attachments"][0]["settings"]
+        self.assertEqual(100, settings["rows"])
+        self.assertEqual([{"name": "id", "type": "int64"}, {"name": "name", "type": "string"}], settings["schema"])
+
+        allocated = pa.total_allocated_bytes()
+        table1 = pull("test/arrow/table")
+        # record batches reference the memory mapped file instead of allocated memory
+        self.assertEqual(allocated, pa.total_allocated_bytes())
+        self.assertIsInstance(table1, pa.Table)
+        self.assertTrue(table.equals(table1))
+        self.assertTrue(table.equals(pull("test/arrow/table", decoder=ArrowDecoder(mmap=False))))
+
+    def test_record_batch(self):
+        batch = pa.record_batch([pa.array([1.5, 2.5]), pa.array([True, None])], names=["x", "flag"])
+        push("test/arrow/batch", batch, encoder=ArrowEncoder(compression="zstd"))
+        batch1 = pull("test/arrow/batch")
+        self.assertIsInstance(batch1, pa.RecordBatch)
+        self.assertTrue(batch.equals(batch1))
@@ -1,8 +1,10 @@
+from unittest import mock
+
 import numpy as np
 import pandas as pd
 
 from dstack import push, pull
-from dstack.pandas.handlers import DataFrameEncoder, SeriesEncoder
+from dstack.pandas.handlers import DataFrameEncoder, SeriesEncoder, DataFrameDecoder, Rows, RowsEncoder
 from tests import TestBase
 
 
@@ -57,3 +59,200 @@ class TestPandas(TestBase):
         self.assertEqual(s.index.dtype, s1.index.dtype)
         self.assertTrue(s.equals(s1))
 
+    def test_columnar_formats(self):
+        df = pd.DataFrame({"float": [1.0, 2.5],
+                           "int": pd.array([1, None], dtype="Int64"),
+                           "datetime": [pd.Timestamp("20180310", tz="UTC"), pd.Timestamp("20200101", tz="UTC")],
+                           "category": pd.Categorical(["a", "b"]),
+                           "string": ["foo", "bar"]},
+                          index=pd.date_range("20130101", periods=2))
+        for storage_format in ["parquet", "arrow"]:
+            stack = f"test/pandas/df_{storage_format}"
+            push(stack, df, encoder=DataFrameEncoder(format=storage_format))
+            df1 = pull(stack)
+            self.assertEqual(list(df.dtypes), list(df1.dtypes))
+            self.assertTrue(df.equals(df1))
+            self.assertEqual(storage_format, self.get_data(stack)["attachments"][0]["settings"]["format"])
+
+    def test_columnar_series(self):
+        s = pd.Series([1.5, None, 3.0], index=[10, 11, 12], name="value")
+        for storage_format in ["parquet", "arrow"]:
+            stack = f"test/pandas/series_{storage_format}"
+            push(stack, s, encoder=SeriesEncoder(format=storage_format, compression="zstd"))
+            s1 = pull(stack)
+            self.assertEqual("value", s1.name)
+            self.assertTrue(s.equals(s1))
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, DataFrameEncoder, format="xml")
+
+    def test_chunked_decode(self):
+        df = pd.DataFrame({"float": np.arange(10) / 2,
+                           "int": pd.array(list(range(9)) + [None], dtype="Int64"),
+                           "datetime": pd.date_range("20180310", periods=10),
+                           "code": ["%03d" % i for i in range(10)]},
+                          index=pd.date_range("20130101", periods=10))
+        df["code"] = df["code"].astype("string")
+        for storage_format in ["csv", "parquet", "arrow"]:
+            stack = f"test/pandas/chunked_{storage_format}"
+            push(stack, df, encoder=DataFrameEncoder(format=storage_format))
+            chunks = list(pull(stack, chunksize=4))
+            self.assertEqual([4, 4, 2], [len(c) for c in chunks])
+            for chunk in chunks:
+                self.assertEqual(list(df.dtypes), list(chunk.dtypes))
+                self.assertEqual(df.index.dtype, chunk.index.dtype)
+            self.assertTrue(df.equals(pd.concat(chunks)))
+
+    def test_chunked_series(self):
+        s = pd.Series(np.arange(5), index=[10, 11, 12, 13, 14])
+        push("test/pandas/chunked_series", s)
+        chunks = list(pull("test/pandas/chunked_series", chunksize=2))
+        self.assertEqual([2, 2, 1], [len(c) for c in chunks])
+        self.assertTrue(s.equals(pd.concat(chunks)))
+
+    def test_chunksize_with_decoder(self):
+        push("test/pandas/chunked_decoder", pd.DataFrame({"x": [1, 2, 3]}))
+        chunks = list(pull("test/pandas/chunked_decoder", decoder=DataFrameDecoder(chunksize=2)))
+        self.assertEqual([2, 1], [len(c) for c in chunks])
+        self.assertRaises(ValueError, pull, "test/pandas/chunked_decoder", decoder=DataFrameDecoder(), chunksize=2)
+
+    def test_projection_and_filters(self):
+        df = pd.DataFrame({"a": np.arange(100),
+                           "b": np.arange(100) / 2,
+                           "day": pd.date_range("20200101", periods=100)},
+                          index=pd.date_range("20130101", periods=100))
+        expected = df[(df["a"] >= 90) & (df["day"] >= pd.Timestamp("20200301"))][["b"]]
+        for storage_format in ["csv", "parquet", "arrow"]:
+            stack = f"test/pandas/filters_{storage_format}"
+            push(stack, df, encoder=DataFrameEncoder(format=storage_format, row_group_size=10))
+            filters = [("a", ">=", 90), ("day", ">=", pd.Timestamp("20200301"))]
+            self.assertTrue(expected.equals(pull(stack, columns=["b"], filters=filters)))
+            chunks = list(pull(stack, columns=["b"], filters=filters, chunksize=4))
+            self.assertTrue(expected.equals(pd.concat(chunks)))
+            self.assertEqual([1, 3, 5], list(pull(stack, filters=[("a", "in", [5, 3, 1])])["a"]))
+
+    def test_row_group_pushdown(self):
+        df = pd.DataFrame({"a": np.arange(100000), "b": np.random.rand(100000), "c": np.random.rand(100000)})
+        push("test/pandas/pushdown", df, encoder=DataFrameEncoder(format="parquet", row_group_size=10000))
+        self.protocol.inline_limit = 0
+
+        full = len(self.get_data("test/pandas/pushdown")["attachments"][0]["data"].value())
+        df1 = pull("test/pandas/pushdown", columns=["b"], filters=[("a", "<", 500)])
+        self.assertTrue(df[df["a"] < 500][["b"]].equals(df1))
+        self.assertLess(self.protocol.downloaded, full / 5)
+
+    def test_ranges_only_for_parquet(self):
+        df = pd.DataFrame({"a": np.arange(10000), "b": np.arange(10000) / 4})
+        self.protocol.inline_limit = 0
+        for storage_format in ["csv", "arrow"]:
+            stack = f"test/pandas/ranges_{storage_format}"
+            push(stack, df, encoder=DataFrameEncoder(format=storage_format))
+            with mock.patch.object(self.protocol, "download_range") as download_range:
+                self.assertTrue(df[["b"]].equals(pull(stack, columns=["b"])))
+                self.assertTrue(df[["b"]].equals(pull(stack, columns=["b"])))
+                download_range.assert_not_called()
+            # the attachment is downloaded once and then read from the cache
+            self.assertEqual(len(self.get_data(stack)["attachments"][0]["data"].value()), self.protocol.downloaded)
+            self.protocol.downloaded = 0
+
+    def test_storage_ignores_ranges(self):
+        df = pd.DataFrame({"a": np.arange(100000), "b": np.random.rand(100000)})
+        push("test/pandas/ignored_ranges", df, encoder=DataFrameEncoder(format="parquet", row_group_size=10000))
+        self.protocol.inline_limit = 0
+        calls = []
+
+        def download_range(url: str, start: int, end: int) -> bytes:
+            calls.append((start, end))
+            return self.protocol.blobs[url]
+
+        with mock.patch.object(self.protocol, "download_range", download_range):
+            for _ in range(2):
+                df1 = pull("test/pandas/ignored_ranges", columns=["b"], filters=[("a", "<", 500)])
+                self.assertTrue(df[df["a"] < 500][["b"]].equals(df1))
+        # the whole content is downloaded only once and cached
+        self.assertEqual(1, len(calls))
+
+    def test_invalid_filters(self):
+        push("test/pandas/invalid_filters", pd.DataFrame({"x": [1, 2, 3]}))
+        self.assertRaises(ValueError, pull, "test/pandas/invalid_filters", filters=[("x", "~", 1)])
+        push("test/pandas/invalid_filters", pd.Series([1, 2, 3]))
+        self.assertRaises(ValueError, pull, "test/pandas/invalid_filters", columns=["x"])
+
+    def test_csv_blocks(self):
+        df = pd.DataFrame({"a": np.arange(1000), "b": np.arange(1000) / 4, "c": ["x%d" % i for i in range(1000)]})
+        expected = DataFrameEncoder().encode(df, None, None).data.value()
+        for workers in [1, 2]:
+            data = DataFrameEncoder(block_size=300, workers=workers).encode(df, None, None).data
+            self.assertEqual(len(expected), data.length())
+            self.assertEqual(expected, data.value())
+            push("test/pandas/csv_blocks", df, encoder=DataFrameEncoder(block_size=300, workers=workers))
+            self.assertTrue(df.equals(pull("test/pandas/csv_blocks")))
+
+        # processes are started only on request
+        with mock.patch("dstack.pandas.handlers.ProcessPoolExecutor") as executor:
+            self.assertEqual(expected, DataFrameEncoder(block_size=300).encode(df, None, None).data.value())
+            executor.assert_not_called()
+        self.assertRaises(ValueError, DataFrameEncoder, workers=0)
+
+    def test_summary(self):
+        df = pd.DataFrame({"a": [1, 2, None, 4],
+                           "b": ["x", "y", "x", None],
+                           "c": pd.date_range("20200101", periods=4)})
+        push("test/pandas/summary", df)
+        handle = pull("test/pandas/summary", lazy=True)
+        a, b, c = handle.settings["summary"]
+        self.assertEqual({"column": "a", "count": 3, "nulls": 1, "distinct": 3, "min": 1.0, "max": 4.0},
+                         {k: v for k, v in a.items() if k != "histogram"})
+        self.assertEqual(3, sum(a["histogram"]["counts"]))
+        self.assertEqual({"column": "b", "count": 3, "nulls": 1, "distinct": 2}, b)
+        self.assertEqual("2020-01-04T00:00:00", c["max"])
+        self.assertEqual(["a", "b", "c"], handle.settings["preview"]["columns"])
+        self.assertEqual(4, len(handle.settings["preview"]["data"]))
+        self.assertFalse(handle.is_loaded())
+
+        push("test/pandas/summary", df, encoder=DataFrameEncoder(summary=False, preview_rows=0))
+        settings = pull("test/pandas/summary", lazy=True).settings
+        self.assertNotIn("summary", settings)
+        self.assertNotIn("preview", settings)
+
+    def test_summary_of_unusual_columns(self):
+        df = pd.DataFrame([[[1, 2], 1 + 2j, 1, 2], [[3], 3 - 1j, 3, 4]], columns=["list", "complex", "x", "x"])
+        push("test/pandas/summary", df)
+        summary = pull("test/pandas/summary", lazy=True).settings["summary"]
+        self.assertEqual({"column": "list", "count": 2, "nulls": 0}, summary[0])
+        self.assertEqual({"column": "complex", "count": 2, "nulls": 0, "distinct": 2}, summary[1])
+        self.assertEqual(["x", "x"], [s["column"] for s in summary[2:]])
+        self.assertEqual([(1, 3), (2, 4)], [(s["min"], s["max"]) for s in summary[2:]])
+
+    def test_summary_of_big_values(self):
+        for values in [[10 ** 18], [1e20], [1e17, 1e17], np.array([2 ** 63 + 5], dtype=np.uint64)]:
+            push("test/pandas/summary", pd.DataFrame({"x": values}))
+            summary = pull("test/pandas/summary", lazy=True).settings["summary"][0]
+            self.assertEqual(len(values), sum(summary["histogram"]["counts"]))
+            self.assertEqual(float(summary["min"]), summary["histogram"]["edges"][0])
+
+    def test_rows(self):
+        schema = {"id": "int64", "name": "string", "time": "datetime64[ns]"}
+        expected = pd.DataFrame({"id": range(25),
+                                 "name": pd.array(["n%d" % i for i in range(25)], dtype="string"),
+                                 "time": pd.date_range("20200101", periods=25)})
+
+        def rows():
+            for i in range(10):
+                yield i, f"n{i}", pd.Timestamp("20200101") + pd.Timedelta(days=i)
+            yield [{"id": i, "name": f"n{i}", "time": f"2020-01-{i + 1:02d}"} for i in range(10, 20)]
+            yield expected.iloc[20:]
+
+        for storage_format in ["csv", "parquet", "arrow"]:
+            stack = f"test/pandas/rows_{storage_format}"
+            push(stack, Rows(rows(), schema, batch_size=4), encoder=RowsEncoder(format=storage_format))
+            settings = self.get_data(stack)["attachments"][0]["settings"]
+            self.assertEqual(25, settings["rows"])
+            self.assertEqual(list(schema.values()), settings["schema"])
+            self.assertTrue(expected.equals(pull(stack)))
+
+        push("test/pandas/rows_empty", Rows([], schema))
+        df = pull("test/pandas/rows_empty")
+        self.assertEqual(0, len(df))
+        self.assertEqual(list(schema.keys()), list(df.columns))
+        self.assertRaises(ValueError, push, "test/pandas/rows_empty", Rows([pd.DataFrame({"id": [1]})], schema))
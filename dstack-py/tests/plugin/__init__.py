@@ -0,0 +1,38 @@
+from typing import Any
+
+from dstack.content import BytesContent, MediaType
+from dstack.handler import EncoderFactory, Encoder, DecoderFactory, Decoder, FrameData
+
+
+class Model(object):
+    def __init__(self, weights: bytes):
+        self.weights = weights
+
+
+class ModelEncoder(Encoder[Model]):
+    def encode(self, obj: Model, description, params) -> FrameData:
+        return FrameData(BytesContent(obj.weights), MediaType("application/octet-stream", "plugin/model"),
+                         description, params)
+
+
+class ModelDecoder(Decoder[Model]):
+    def decode(self, data: FrameData) -> Model:
+        return Model(data.data.value())
+
+
+class ModelEncoderFactory(EncoderFactory):
+    priority = 1
+
+    def accept(self, obj: Any) -> bool:
+        return isinstance(obj, Model)
+
+    def create(self) -> Encoder:
+        return ModelEncoder()
+
+
+class ModelDecoderFactory(DecoderFactory):
+    def accept(self, obj: MediaType) -> bool:
+        return obj.application == "plugin/model"
+
+    def create(self) -> Decoder:
+        return ModelDecoder()
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import numpy as np
 import torch
 from torch.autograd import Variable
@@ -70,3 +72,60 @@ class TestTorch(TestBase):
         my_model: LinearRegression = pull("my_torch_model", decoder=TorchModelWeightsDecoder(model1))
         self.assertEqual(model1, my_model)
         self.assertEqual(model.state_dict(), my_model.state_dict())
+
+    def test_tensors(self):
+        from dstack.torch.handlers import TorchModelEncoder, TorchModelWeightsDecoder
+
+        model = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.BatchNorm1d(8), torch.nn.Linear(8, 1))
+        model.eval()
+        push("test/torch/tensors", model, encoder=TorchModelEncoder(format="tensors"))
+        attach = self.get_data("test/torch/tensors")["attachments"][0]
+        self.assertEqual("torch/tensors", attach["application"])
+        self.assertEqual(len(model.state_dict()), attach["settings"]["tensors"])
+
+        state = pull("test/torch/tensors")
+        self.assertEqual(list(model.state_dict()), list(state))
+        for name, tensor in model.state_dict().items():
+            self.assertTrue(torch.equal(tensor, state[name]))
+
+        # tensors are built on a private mapping, so changes don't reach the cached file
+        state["0.weight"].zero_()
+        self.assertTrue(torch.equal(model.state_dict()["0.weight"], pull("test/torch/tensors")["0.weight"]))
+
+        model1 = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.BatchNorm1d(8), torch.nn.Linear(8, 1))
+        pull("test/torch/tensors", decoder=TorchModelWeightsDecoder(model1))
+        x = torch.randn(4, 16)
+        self.assertTrue(torch.equal(model(x), model1(x)))
+
+        self.assertRaises(ValueError, TorchModelEncoder, format="onnx")
+        self.assertRaises(ValueError, TorchModelEncoder, store_whole_model=True, format="tensors")
+
+        # torch.frombuffer appeared in torch 1.10
+        with mock.patch.object(torch, "frombuffer", create=True):
+            del torch.frombuffer
+            self.assertRaises(ValueError, TorchModelEncoder, format="tensors")
+            self.assertRaises(ValueError, pull, "test/torch/tensors")
+
+    def test_reduced_precision(self):
+        from dstack.torch.handlers import TorchModelEncoder, TorchModelDecoder
+
+        model = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.BatchNorm1d(8))
+        for format in ["pickle", "tensors"]:
+            stack = f"test/torch/precision/{format}"
+            push(stack, model, encoder=TorchModelEncoder(format=format, dtype=torch.float16))
+            precision = self.get_data(stack)["attachments"][0]["settings"]["precision"]
+            self.assertEqual("float16", precision["dtype"])
+            self.assertEqual("float32", precision["dtypes"]["0.weight"])
+            self.assertNotIn("1.num_batches_tracked", precision["dtypes"])
+            self.assertLess(precision["reduced_size"], precision["size"])
+
+            state = pull(stack)
+            self.assertEqual(torch.float32, state["0.weight"].dtype)
+            self.assertEqual(torch.int64, state["1.num_batches_tracked"].dtype)
+            self.assertTrue(torch.equal(model.state_dict()["0.weight"].half().float(), state["0.weight"]))
+
+            state = pull(stack, decoder=TorchModelDecoder(restore_dtypes=False))
+            self.assertEqual(torch.float16, state["0.weight"].dtype)
+
+        self.assertRaises(ValueError, TorchModelEncoder, dtype=torch.int8)
+        self.assertRaises(ValueError, TorchModelEncoder, store_whole_model=True, dtype=torch.float16)
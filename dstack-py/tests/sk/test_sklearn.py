@@ -25,3 +25,29 @@ class TestSklearn(TestBase):
         self.assertEqual(std_reg.coef_, my_model.coef_)
         self.assertEqual(std_reg.intercept_, my_model.intercept_)
         self.assertEqual(std_reg.normalize, my_model.normalize)
+
+    def test_compression(self):
+        from sklearn.ensemble import RandomForestRegressor
+        from dstack.sklearn.handlers import SklearnModelEncoder
+        from dstack.sklearn.persistence import JoblibPersistence, PicklePersistence
+
+        x, y = make_regression(n_samples=200, n_features=4, random_state=0)
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(x, y)
+
+        for codec in ["gzip", "bz2", "lzma"]:
+            push("test/sklearn/compressed", model, encoder=SklearnModelEncoder(compress=codec, level=6))
+            compression = self.get_data("test/sklearn/compressed")["attachments"][0]["settings"]["compression"]
+            self.assertEqual(codec, compression["codec"])
+            self.assertLess(compression["compressed_size"], compression["size"])
+            self.assertTrue((model.predict(x) == pull("test/sklearn/compressed").predict(x)).all())
+
+        push("test/sklearn/pickle", model, encoder=SklearnModelEncoder(PicklePersistence(), compress="gzip"))
+        self.assertTrue((model.predict(x) == pull("test/sklearn/pickle").predict(x)).all())
+
+        push("test/sklearn/joblib", model, encoder=SklearnModelEncoder(JoblibPersistence("zlib", 3)))
+        settings = self.get_data("test/sklearn/joblib")["attachments"][0]["settings"]
+        self.assertEqual({"compress": "zlib", "level": 3}, settings["joblib"])
+        self.assertTrue((model.predict(x) == pull("test/sklearn/joblib").predict(x)).all())
+
+        self.assertRaises(ValueError, SklearnModelEncoder, compress="zip")
+        self.assertRaises(ValueError, JoblibPersistence, "zip")
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+import dstack.auto
+from dstack import push, pull, register_encoder
+from dstack.auto import AutoHandler, UnsupportedObjectTypeException, EncoderIndex, DecoderIndex, ENCODERS_GROUP, \
+    DECODERS_GROUP, ENCODERS
+from dstack.content import MediaType
+from dstack.files import FileEncoderFactory
+from dstack.pandas import DataFrameEncoderFactory, GeneralCsvDecoderFactory, DataFrameDecoderFactory
+from tests import TestBase
+
+try:
+    from importlib.metadata import EntryPoint
+except ImportError:
+    # Python 3.7 and older
+    from collections import namedtuple
+    from importlib import import_module
+
+    class EntryPoint(namedtuple("EntryPoint", ["name", "value", "group"])):
+        def load(self):
+            module, attr = self.value.split(":")
+            return getattr(import_module(module), attr)
+
+
+class TestAutoHandler(TestBase):
+    def test_encoder_index(self):
+        encoders = AutoHandler().encoders
+        self.assertIsInstance(encoders.find(pd.DataFrame()), DataFrameEncoderFactory)
+        self.assertIs(encoders, AutoHandler().encoders)
+        self.assertIn(pd.DataFrame, encoders.by_type)
+        self.assertIsInstance(encoders.find(pd.DataFrame({"x": [1]})), DataFrameEncoderFactory)
+
+    def test_value_dependent_factory(self):
+        encoders = AutoHandler().encoders
+        with tempfile.TemporaryDirectory() as d:
+            file = Path(d) / "file.txt"
+            file.write_text("text")
+            self.assertIsInstance(encoders.find(file), FileEncoderFactory)
+            # the same type, but directories are not accepted
+            self.assertRaises(UnsupportedObjectTypeException, encoders.find, Path(d))
+            self.assertIsInstance(encoders.find(file), FileEncoderFactory)
+
+    def test_decoder_index(self):
+        decoders = AutoHandler().decoders
+        self.assertIsInstance(decoders.find(MediaType("text/csv", "pandas/dataframe")), DataFrameDecoderFactory)
+        self.assertIsInstance(decoders.find(MediaType("text/csv", None)), GeneralCsvDecoderFactory)
+        self.assertIn(("text/csv", None), decoders.by_media)
+        self.assertRaises(UnsupportedObjectTypeException, decoders.find, MediaType("image/png", None))
+
+    def test_unsupported_options(self):
+        push("test/auto/options", np.arange(3))
+        self.assertRaisesRegex(ValueError, "chunksize", pull, "test/auto/options", chunksize=2)
+        push("test/auto/options", LinearRegression().fit([[0], [1]], [0, 1]))
+        self.assertRaisesRegex(ValueError, "columns", pull, "test/auto/options", columns=["x"])
+
+    def test_register_encoder(self):
+        class CustomFactory(DataFrameEncoderFactory):
+            pass
+
+        custom = CustomFactory()
+        self.assertIsInstance(ENCODERS.find(pd.DataFrame()), DataFrameEncoderFactory)
+        try:
+            register_encoder(custom)
+            self.assertIs(custom, ENCODERS.find(pd.DataFrame()))
+        finally:
+            ENCODERS.registered.remove(ENCODERS.registered[-1])
+            ENCODERS.clear()
+        self.assertIsNot(custom, ENCODERS.find(pd.DataFrame()))
+
+    def test_plugins(self):
+        sys.modules.pop("tests.plugin", None)
+        entry_points = {
+            ENCODERS_GROUP: [EntryPoint("tests.plugin.Model", "tests.plugin:ModelEncoderFactory", ENCODERS_GROUP)],
+            DECODERS_GROUP: [EntryPoint("plugin/model", "tests.plugin:ModelDecoderFactory", DECODERS_GROUP)]}
+        encoders = EncoderIndex(ENCODERS.factories)
+        decoders = DecoderIndex(AutoHandler().decoders.factories)
+
+        with mock.patch.object(dstack.auto, "_entry_points", lambda group: entry_points[group]), \
+                mock.patch.object(dstack.auto, "ENCODERS", encoders), \
+                mock.patch.object(dstack.auto, "DECODERS", decoders):
+            self.assertIsInstance(encoders.find(pd.DataFrame()), DataFrameEncoderFactory)
+            decoders.find(MediaType("text/csv", "pandas/dataframe"))
+            # plugins are not imported until an object of their type shows up
+            self.assertNotIn("tests.plugin", sys.modules)
+
+            from tests.plugin import Model
+            push("test/plugin", Model(b"weights"))
+            self.assertEqual("plugin/model", self.get_data("test/plugin")["attachments"][0]["application"])
+            self.assertEqual(b"weights", pull("test/plugin").weights)
+            self.assertEqual(1, encoders.plugins[0].priority())
@@ -0,0 +1,105 @@
+import json
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from dstack.auto import AutoHandler
+from dstack.downsampling import downsample, lttb, minmax
+from dstack.plotly.handlers import PlotlyEncoder
+
+
+class TestDownsampling(TestCase):
+    def test_lttb(self):
+        y = np.array([0, 1, 0, 9, 0, 1, 0, 1, -7, 1, 0], dtype=float)
+        indices = lttb(np.arange(len(y), dtype=float), y, 5)
+        self.assertEqual(5, len(indices))
+        self.assertEqual([0, 10], [indices[0], indices[-1]])
+        self.assertIn(3, indices)
+        self.assertIn(8, indices)
+
+    def test_minmax(self):
+        y = np.random.rand(10001)
+        y[1234] = 2
+        y[5678] = -1
+        y[4000:4010] = np.nan
+        indices = minmax(y, 100)
+        self.assertLessEqual(len(indices), 104)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(1234, indices)
+        self.assertIn(5678, indices)
+        self.assertFalse(np.isnan(y[indices]).any())
+
+    def test_downsample(self):
+        self.assertEqual([0, 1, 2], list(downsample(None, [3, 1, 2], 10)))
+        self.assertIsNone(downsample(None, ["a"] * 10, 3))
+        x = np.arange("2020-01-01", "2020-03-01", dtype="datetime64[D]")
+        self.assertEqual(10, len(downsample(x, np.random.rand(len(x)), 10)))
+
+    def test_plotly(self):
+        x = np.arange(100000)
+        fig = go.Figure([go.Scatter(x=x, y=np.sin(x / 100), text=[str(i) for i in x]),
+                         go.Scatter(x=[1, 2], y=[3, 4]),
+                         go.Histogram(x=np.random.rand(5000))])
+        data = PlotlyEncoder(max_points=1000).encode(fig, None, None)
+        self.assertEqual({"method": "lttb", "points": [100000], "kept": [1000], "ratio": 100.0},
+                         data.settings["downsampling"])
+
+        traces = json.loads(data.data.value())["data"]
+        self.assertEqual(1000, len(traces[0]["x"]))
+        self.assertEqual([str(i) for i in traces[0]["x"]], traces[0]["text"])
+        self.assertEqual([1, 2], traces[1]["x"])
+        self.assertEqual(5000, len(traces[2]["x"]))
+        self.assertEqual(100000, len(fig.data[0].x))
+
+        self.assertNotIn("downsampling", PlotlyEncoder().encode(fig, None, None).settings)
+        self.assertRaises(ValueError, PlotlyEncoder, max_points=2)
+        self.assertRaises(ValueError, PlotlyEncoder, method="random")
+
+    def test_plotly_datetimes(self):
+        x = pd.date_range("20200101", periods=10000, freq="h").to_numpy()
+        fig = go.Figure([go.Scatter(x=x, y=np.random.rand(len(x)))])
+        expected = json.loads(PlotlyEncoder().encode(fig, None, None).data.value())["data"][0]["x"]
+        trace = json.loads(PlotlyEncoder(max_points=100).encode(fig, None, None).data.value())["data"][0]
+        self.assertEqual(100, len(trace["x"]))
+        # datetimes are serialized the same way as without downsampling
+        self.assertTrue(set(trace["x"]) <= set(expected))
+        self.assertEqual(expected[0], trace["x"][0])
+
+    def test_bokeh(self):
+        from bokeh.embed import json_item
+        from bokeh.models import ColumnDataSource
+        from bokeh.plotting import figure
+        from dstack.bokeh.handlers import BokehEncoder
+
+        x = np.arange(100000)
+        source = ColumnDataSource({"x": x, "y": np.sin(x / 100), "label": [str(i) for i in x]})
+        fig = figure()
+        fig.line("x", "y", source=source)
+
+        serialized = []
+
+        def serialize(obj):
+            serialized.append(dict(source.data))
+            return json_item(obj)
+
+        with mock.patch("dstack.bokeh.handlers.json_item", serialize):
+            data = BokehEncoder(max_points=1000).encode(fig, None, None)
+        self.assertEqual({"method": "lttb", "points": [100000], "kept": [1000], "ratio": 100.0},
+                         data.settings["downsampling"])
+        # other columns are sliced with the same indices
+        columns = serialized[0]
+        self.assertEqual([1000] * 3, [len(columns[k]) for k in ["x", "y", "label"]])
+        self.assertTrue(np.array_equal(np.sin(columns["x"] / 100), columns["y"]))
+        self.assertEqual([str(i) for i in columns["x"]], list(columns["label"]))
+        # the source is restored after encoding
+        self.assertEqual(100000, len(source.data["label"]))
+        self.assertTrue(np.array_equal(x, source.data["x"]))
+
+        self.assertIsInstance(AutoHandler().encoders.find(fig).create(), BokehEncoder)
+
+        with mock.patch("dstack.bokeh.handlers.json_item", side_effect=RuntimeError("failed")):
+            self.assertRaises(RuntimeError, BokehEncoder(max_points=1000).encode, fig, None, None)
+        self.assertEqual(100000, len(source.data["y"]))
+        self.assertTrue(np.array_equal(x, source.data["x"]))
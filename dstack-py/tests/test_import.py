@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+import dstack as ds
+
+# modules which must be imported only when they are actually used
+DEFERRED_MODULES = ["dstack.auto", "requests", "yaml", "tqdm", "cloudpickle", "pkg_resources", "pandas", "numpy",
+                    "matplotlib"]
+
+# module __getattr__ requires Python 3.7, so older versions import lazy attributes of the package eagerly
+if sys.version_info < (3, 7):
+    DEFERRED_MODULES = [m for m in DEFERRED_MODULES if m not in ("dstack.auto", "tqdm")]
+
+# cumulative time of `import dstack` in microseconds, generous to tolerate slow machines
+IMPORT_TIME_BUDGET = 500000
+
+
+def _python(*args: str) -> str:
+    result = subprocess.run([sys.executable, *args], cwd=str(Path(__file__).parent.parent), stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    return result.stdout + result.stderr
+
+
+class TestImport(TestCase):
+    def test_deferred_modules(self):
+        output = _python("-c", "import sys, dstack; print(' '.join(sorted(sys.modules)))")
+        modules = set(output.split())
+        self.assertEqual([], [m for m in DEFERRED_MODULES if m in modules])
+
+    def test_import_time(self):
+        output = _python("-X", "importtime", "-c", "import dstack")
+        lines = [line.split("|") for line in output.splitlines() if line.startswith("import time:")]
+        cumulative = [int(line[1]) for line in lines if line[2].strip() == "dstack"]
+        self.assertEqual(1, len(cumulative))
+        self.assertLess(cumulative[0], IMPORT_TIME_BUDGET)
+
+    def test_lazy_attributes(self):
+        from dstack.auto import AutoHandler, register_encoder
+        from dstack.tqdm import tqdm, trange
+        self.assertIs(tqdm, ds.tqdm)
+        self.assertIs(trange, ds.trange)
+        self.assertIs(AutoHandler, ds.AutoHandler)
+        self.assertIs(register_encoder, ds.register_encoder)
+        self.assertIn("tqdm", dir(ds))
+        self.assertIn("AutoHandler", dir(ds))
+        self.assertRaises(AttributeError, getattr, ds, "missing")
+
+    def test_submodule_first(self):
+        output = _python("-c", "import dstack.tqdm; import dstack; print(isinstance(dstack.tqdm, type))")
+        self.assertEqual("True", output.strip())
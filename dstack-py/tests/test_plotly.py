@@ -0,0 +1,69 @@
+import base64
+import json
+from unittest import TestCase, mock
+
+import numpy as np
+import plotly.graph_objects as go
+
+from dstack.plotly.handlers import PlotlyEncoder
+
+
+def _array(typed_array):
+    a = np.frombuffer(base64.b64decode(typed_array["bdata"]), dtype="<" + typed_array["dtype"])
+    if "shape" in typed_array:
+        a = a.reshape([int(d) for d in typed_array["shape"].split(",")])
+    return a
+
+
+class TestPlotly(TestCase):
+    def test_binary(self):
+        y = np.random.rand(1000)
+        y[10] = np.nan
+        z = np.arange(12, dtype=np.int64).reshape(3, 4) * 1000
+        fig = go.Figure([go.Scatter(x=np.arange(1000), y=y, text=["a"] * 1000, marker=dict(size=np.full(1000, 5))),
+                         go.Heatmap(z=z),
+                         go.Scatter(x=[1, 2], y=(3.5, 4.5), meta={"a": [1, 2]}),
+                         go.Pie(values=[1, 2], domain=dict(x=[0, 0.5]))])
+        fig.update_layout(title="binary")
+
+        data = PlotlyEncoder(binary=True, plotly_js_version="2.35.2").encode(fig, None, None)
+        self.assertEqual(7, data.settings["typed_arrays"])
+        figure = json.loads(data.data.value())
+        scatter, heatmap = figure["data"][0], figure["data"][1]
+        self.assertEqual("i2", scatter["x"]["dtype"])
+        self.assertTrue(np.array_equal(np.arange(1000), _array(scatter["x"])))
+        self.assertEqual("f8", scatter["y"]["dtype"])
+        self.assertTrue(np.array_equal(y, _array(scatter["y"]), equal_nan=True))
+        self.assertEqual("i1", scatter["marker"]["size"]["dtype"])
+        self.assertEqual(["a"] * 1000, scatter["text"])
+        self.assertEqual("3, 4", heatmap["z"]["shape"])
+        self.assertTrue(np.array_equal(z, _array(heatmap["z"])))
+        # lists and tuples of data arrays are converted too, but other lists stay lists
+        self.assertTrue(np.array_equal([1, 2], _array(figure["data"][2]["x"])))
+        self.assertTrue(np.array_equal([3.5, 4.5], _array(figure["data"][2]["y"])))
+        self.assertEqual({"a": [1, 2]}, figure["data"][2]["meta"])
+        self.assertTrue(np.array_equal([1, 2], _array(figure["data"][3]["values"])))
+        self.assertEqual([0, 0.5], figure["data"][3]["domain"]["x"])
+        self.assertEqual("binary", figure["layout"]["title"]["text"])
+        self.assertEqual(1000, len(fig.data[0].y))
+
+        with mock.patch.dict("sys.modules", {"orjson": None}):
+            self.assertEqual(figure, json.loads(PlotlyEncoder(binary=True, plotly_js_version="2.35.2").encode(fig, None, None).data.value()))
+
+    def test_binary_requires_plotly_js_version(self):
+        self.assertRaises(ValueError, PlotlyEncoder, binary=True)
+        self.assertRaises(ValueError, PlotlyEncoder, binary=True, plotly_js_version="1.58.4")
+
+    def test_binary_large_integers(self):
+        fig = go.Figure([go.Scatter(x=np.array([0, 2 ** 40]), y=np.array([1.5, 2.5], dtype=np.float32))])
+        figure = json.loads(PlotlyEncoder(binary=True, plotly_js_version="2.35.2").encode(fig, None, None).data.value())
+        self.assertEqual([0, 2 ** 40], figure["data"][0]["x"])
+        self.assertEqual("f4", figure["data"][0]["y"]["dtype"])
+
+    def test_binary_downsampled(self):
+        x = np.arange(100000)
+        fig = go.Figure([go.Scatter(x=x, y=np.sin(x / 100), text=[str(i) for i in x])])
+        data = PlotlyEncoder(max_points=1000, binary=True, plotly_js_version="2.35.2").encode(fig, None, None)
+        trace = json.loads(data.data.value())["data"][0]
+        self.assertEqual(1000, len(_array(trace["y"])))
+        self.assertEqual([str(i) for i in _array(trace["x"])], trace["text"])
@@ -59,3 +59,25 @@ class TestJsonProtocol(TestCase):
         }
         protocol = JsonProtocol("http://myhost", True)
         self.assertEqual(protocol.length(data), length(data))
+
+    def test_pull_by_meta(self):
+        class StubProtocol(JsonProtocol):
+            def __init__(self):
+                super().__init__("http://myhost", True)
+                self.endpoints = []
+
+            def do_request(self, endpoint, data, token, method="POST", stack=None):
+                self.endpoints.append(endpoint)
+                if endpoint == "/stacks/user/my_stack":
+                    return {"stack": {"head": {"id": "f2", "attachments": []},
+                                      "frames": [{"id": "f1", "params": {"run": 1}},
+                                                 {"id": "f2", "params": {"run": 2}}]}}
+                if endpoint == "/frames/user/my_stack/f1":
+                    return {"frame": {"attachments": [{"params": {"x": 1}}, {"params": {"x": 2}}]}}
+                return {"attachment": {"content_type": "text/plain"}}
+
+        protocol = StubProtocol()
+        frame, index, res = protocol.pull("user/my_stack", None, {"x": 2}, {"run": 1})
+        self.assertEqual("f1", frame)
+        self.assertEqual(1, index)
+        self.assertEqual("/attachs/user/my_stack/f1/1?download=true", protocol.endpoints[-1])
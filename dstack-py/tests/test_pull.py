@@ -0,0 +1,226 @@
+import time
+from unittest import mock
+
+import pandas as pd
+
+import dstack as ds
+from dstack.config import get_cache_dir
+from dstack.protocol import StackNotFoundError
+from tests import TestBase
+
+
+class StackDecoder(ds.Decoder):
+    def decode(self, data: ds.FrameData) -> str:
+        # the context is read after a pause, so a decoder shared between threads would see another context
+        time.sleep(0.01)
+        return self._context.stack
+
+
+class TestPull(TestBase):
+    def test_pull_many(self):
+        for i in range(5):
+            ds.push(f"test/many/{i}", pd.DataFrame({"x": [i, i + 1]}))
+
+        specs = [(f"test/many/{i}", None, None) for i in range(5)]
+        specs.append("test/many/missing")
+        specs.append(("test/many/2",))
+        results = ds.pull_many(specs)
+
+        self.assertEqual(7, len(results))
+        for i in range(5):
+            self.assertTrue(results[i].ok())
+            self.assertEqual([i, i + 1], list(results[i].value["x"]))
+        self.assertFalse(results[5].ok())
+        self.assertIsInstance(results[5].error, StackNotFoundError)
+        self.assertEqual([2, 3], list(results[6].value["x"]))
+
+    def test_pull_many_decoder_factory(self):
+        for i in range(5):
+            ds.push(f"test/many/{i}", pd.DataFrame({"x": [i]}))
+
+        decoders = []
+
+        def decoder_factory() -> ds.Decoder:
+            decoder = StackDecoder()
+            decoders.append(decoder)
+            return decoder
+
+        results = ds.pull_many([f"test/many/{i}" for i in range(5)], decoder_factory=decoder_factory,
+                               decode_workers=5)
+        self.assertEqual([f"test/many/{i}" for i in range(5)], [r.value for r in results])
+        self.assertEqual(5, len(set(map(id, decoders))))
+
+    def test_pull_many_same_attachment(self):
+        ds.push("test/many/same", pd.DataFrame({"x": range(1000)}))
+        # different specs which resolve to the same attachment are pulled concurrently into the same cache file
+        specs = [("test/many/same", None if i % 2 == 0 else {}, None) for i in range(8)]
+        results = ds.pull_many(specs, max_workers=8)
+        for r in results:
+            self.assertEqual(list(range(1000)), list(r.value["x"]))
+
+        # temporary files are replaced into place
+        for kind in ["files", "attachs"]:
+            self.assertEqual([], list((get_cache_dir() / kind).glob("*/test/many/same/**/*.tmp")))
+
+    def test_pull_many_empty(self):
+        self.assertEqual([], ds.pull_many([]))
+
+    def test_pull_many_bad_spec(self):
+        self.assertRaises(ValueError, ds.pull_many, [("a", None, None, None)])
+
+    def test_pull_lazy(self):
+        df = pd.DataFrame({"x": [1, 2, 3]})
+        ds.push("test/lazy", df, params={"kind": "table"})
+        handle = ds.pull("test/lazy", lazy=True)
+
+        self.assertFalse(handle.is_loaded())
+        self.assertEqual({"kind": "table"}, handle.params)
+        self.assertEqual("text/csv", handle.media_type().content_type)
+        self.assertEqual("pandas/dataframe", handle.application)
+        self.assertEqual(["int64", "int64"], handle.settings["schema"])
+
+        df1 = handle.value()
+        self.assertTrue(handle.is_loaded())
+        self.assertTrue(df.equals(df1))
+        self.assertIs(df1, handle.value())
+
+    def test_prefetch(self):
+        for i in range(3):
+            ds.push(f"test/prefetch/{i}", pd.DataFrame({"x": [i]}))
+
+        handles = [ds.pull(f"test/prefetch/{i}", lazy=True) for i in range(3)]
+        for future in ds.prefetch(*handles):
+            future.result()
+
+        for i, handle in enumerate(handles):
+            self.assertTrue(handle.is_loaded())
+            self.assertEqual([i], list(handle.value()["x"]))
+
+    def test_watch(self):
+        ds.push("test/watch", pd.DataFrame({"x": [1]}))
+        frames = ds.watch("test/watch", interval=0)
+        self.assertEqual([1], list(next(frames)["x"]))
+
+        ds.push("test/watch", pd.DataFrame({"x": [2]}))
+        self.assertEqual([2], list(next(frames)["x"]))
+
+    def test_watch_by_frame(self):
+        ds.push("test/watch", pd.DataFrame({"x": [1]}))
+        # only the head and the frame are requested, but not the whole stack
+        with mock.patch.object(self.protocol, "pull", side_effect=AssertionError("stack pulled")):
+            frames = ds.watch("test/watch", interval=0)
+            self.assertEqual([1], list(next(frames)["x"]))
+            ds.push("test/watch", pd.DataFrame({"x": [2]}))
+            self.assertEqual([2], list(next(frames)["x"]))
+
+    def test_watch_callback(self):
+        ds.push("test/watch", pd.DataFrame({"x": [1]}))
+        received = []
+        ds.watch("test/watch", callback=received.append, interval=0.01, timeout=0.1)
+        self.assertEqual(1, len(received))
+        self.assertEqual([1], list(received[0]["x"]))
+
+    def test_watch_errors(self):
+        ds.push("test/watch", pd.DataFrame({"x": [1]}))
+        pull_attach = ds._pull_attach
+
+        def failing(errors: list):
+            def f(*args, **kwargs):
+                if len(errors) > 0:
+                    raise errors.pop(0)
+                return pull_attach(*args, **kwargs)
+            return f
+
+        # a failed download is retried after the backoff
+        with mock.patch("dstack._pull_attach", failing([IOError("failed")])):
+            frames = ds.watch("test/watch", interval=0.01, max_interval=0.01, timeout=5)
+            self.assertEqual([1], list(next(frames)["x"]))
+
+        # a frame without the requested attachment is skipped
+        with mock.patch("dstack._pull_attach", failing([ds.MatchError({}, {})])):
+            self.assertEqual([], list(ds.watch("test/watch", interval=0.01, timeout=0.1)))
+
+    def test_watch_missing_stack(self):
+        received = []
+        ds.watch("test/watch/missing", callback=received.append, interval=0.01, timeout=0.05)
+        self.assertEqual(0, len(received))
+
+    def test_frames(self):
+        for i in range(5):
+            ds.push("test/history", pd.DataFrame({"x": [i]}), meta=ds.FrameMeta(run=i))
+
+        pages = list(ds.frames("test/history", page_size=2))
+        self.assertEqual([2, 2, 1], [len(p) for p in pages])
+        history = [f for p in pages for f in p]
+        self.assertEqual(list(range(5)), [f.params["run"] for f in history])
+
+        df = ds.pull("test/history", frame=history[1].id)
+        self.assertEqual([1], list(df["x"]))
+
+        df = ds.pull("test/history", frame=history[3].id, attach_index=0)
+        self.assertEqual([3], list(df["x"]))
+
+        self.assertRaises(ValueError, ds.frames, "test/history", page_size=0)
+
+    def test_pull_attach_index(self):
+        f = ds.frame("test/attach_index")
+        f.add(pd.DataFrame({"x": [1]}), params={"i": 1})
+        f.add(pd.DataFrame({"x": [2]}), params={"i": 2})
+        f.push()
+
+        self.assertEqual([2], list(ds.pull("test/attach_index", attach_index=1)["x"]))
+        self.assertEqual([1], list(ds.pull("test/attach_index", frame=f.id, i=1)["x"]))
+
+    def test_pull_frame(self):
+        f = ds.frame("test/pull_frame")
+        for i in range(4):
+            f.add(pd.DataFrame({"x": [i]}), params={"i": i})
+        f.push()
+
+        attachments = ds.pull_frame("test/pull_frame")
+        self.assertEqual(4, len(attachments))
+        decoder = ds.AutoHandler()
+        for i, data in enumerate(attachments):
+            self.assertEqual({"i": i}, data.params)
+            self.assertEqual([i], list(decoder.decode(data)["x"]))
+
+        handles = ds.pull_frame("test/pull_frame", frame=f.id, lazy=True)
+        self.assertEqual(4, len(handles))
+        self.assertFalse(handles[2].is_loaded())
+        self.assertEqual({"i": 2}, handles[2].params)
+        self.assertEqual([2], list(handles[2].value()["x"]))
+
+    def test_append(self):
+        df = pd.DataFrame({"x": range(10)}, index=pd.date_range("20200101", periods=10))
+        for i in range(0, 6, 2):
+            ds.append("test/append", df.iloc[i:i + 2])
+
+        segments = ds.pull_segments("test/append")
+        self.assertEqual(3, len(segments))
+        self.assertEqual([2, 2, 2], [len(s) for s in segments])
+        # iterated segments are not kept in memory
+        self.assertEqual([None] * 3, [h._value for h in segments.handles])
+        self.assertTrue(df.iloc[:6].equals(segments.value()))
+
+        self.assertIsNotNone(ds.compact("test/append"))
+        self.assertIsNone(ds.compact("test/append"))
+        ds.append("test/append", df.iloc[6:8], compact_every=3)
+        segments = ds.pull_segments("test/append")
+        self.assertEqual(2, len(segments))
+        self.assertEqual("parquet", segments.handles[0].settings["format"])
+        self.assertTrue(df.iloc[:8].equals(segments.value()))
+
+        ds.append("test/append", df.iloc[8:9], compact_every=3)
+        ds.append("test/append", df.iloc[9:10], compact_every=3)
+        segments = ds.pull_segments("test/append")
+        self.assertEqual(1, len(segments))
+        self.assertTrue(df.equals(segments.value()))
+
+    def test_compact_concurrent_append(self):
+        ds.append("test/append", pd.DataFrame({"x": [1]}))
+        history = self.protocol.frames("user/test/append", None)
+        ds.append("test/append", pd.DataFrame({"x": [2]}))
+        # a compaction which listed only the first segment
+        ds.push("test/append", pd.DataFrame({"x": [1]}),
+                meta=ds.FrameMeta({"segment": "compacted", "last": history[-1]["id"]}))
+        self.assertEqual([1, 2], list(ds.pull_segments("test/append").value()["x"]))
@@ -0,0 +1,57 @@
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from dstack.content import SpooledContent, FileContent, BytesContent
+from dstack.util import write_archive, unpack_archive, unpacked_path
+
+
+class TestUtil(TestCase):
+    def test_write_archive(self):
+        with TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src"
+            (src / "variables").mkdir(parents=True)
+            (src / "saved_model.pb").write_bytes(b"model" * 1000)
+            (src / "variables" / "variables.index").write_bytes(b"index")
+
+            for archive in ["zip", "tar", "gztar", "bztar", "xztar"]:
+                for store in [False, True]:
+                    content = SpooledContent()
+                    write_archive(src, archive, content.file, store)
+                    filename = Path(tmp) / f"{archive}-{store}"
+                    filename.write_bytes(content.value())
+
+                    unpacked = Path(tmp) / f"{archive}-{store}-unpacked"
+                    shutil.unpack_archive(str(filename), extract_dir=str(unpacked), format=archive)
+                    self.assertEqual(b"model" * 1000, (unpacked / "saved_model.pb").read_bytes())
+                    self.assertEqual(b"index", (unpacked / "variables" / "variables.index").read_bytes())
+
+            self.assertRaises(ValueError, write_archive, src, "rar", SpooledContent().file)
+
+    def test_unpack_archive(self):
+        with TemporaryDirectory() as tmp:
+            src = Path(tmp) / "src"
+            src.mkdir()
+            (src / "data.shp").write_bytes(b"shapes")
+            content = SpooledContent()
+            write_archive(src, "zip", content.file)
+            archive = Path(tmp) / "0"
+            archive.write_bytes(content.value())
+            cache_dir = Path(tmp) / "cache"
+
+            with mock.patch("shutil.unpack_archive", wraps=shutil.unpack_archive) as unpack:
+                directory = unpack_archive(FileContent(archive), "zip", cache_dir)
+                self.assertEqual(unpacked_path(archive), directory)
+                self.assertEqual(b"shapes", (directory / "data.shp").read_bytes())
+                self.assertEqual(directory, unpack_archive(FileContent(archive), "zip", cache_dir))
+                self.assertEqual(1, unpack.call_count)
+
+                directory = unpack_archive(BytesContent(archive.read_bytes()), "zip", cache_dir)
+                self.assertEqual(cache_dir, directory.parent)
+                self.assertEqual(b"shapes", (directory / "data.shp").read_bytes())
+                self.assertEqual(directory, unpack_archive(BytesContent(archive.read_bytes()), "zip", cache_dir))
+                self.assertEqual(2, unpack.call_count)
+
+            # only the archive and the unpacked directory are left
+            self.assertEqual(2, len(list(cache_dir.iterdir())))